@@ -10,6 +10,7 @@
 - LLM_BASE_URL: API基础URL
 - LLM_API_KEY: API密钥
 - LLM_BATCH_SIZE: 批量处理大小
+- LLM_USE_BATCH_API: 是否通过 Batch API 提交解读请求（true/false）
 - EMAIL_SMTP_SERVER: SMTP服务器
 - EMAIL_SMTP_PORT: SMTP端口
 - EMAIL_SENDER: 发送方邮箱
@@ -17,21 +18,36 @@
 - EMAIL_RECIPIENTS: 收件人，JSON格式，如 '["a@b.com", "c@d.com"]'
 """
 import os
+import copy
 import json
-import yaml
+from functools import lru_cache
 from pathlib import Path
 from dataclasses import dataclass, field
 from typing import List, Optional, Union, Dict
 
+# YAML解析器，首次解析YAML时才导入 PyYAML（JSON缓存命中时完全不需要）
+_YAML_LOADER = None
 
-def _parse_json_env(env_name: str, default=None):
+
+def _get_yaml_loader():
+    """获取YAML解析器：优先使用 libyaml 提供的 C 解析器，未编译 libyaml 时回退到纯 Python 实现"""
+    global _YAML_LOADER
+    if _YAML_LOADER is None:
+        try:
+            from yaml import CSafeLoader as loader
+        except ImportError:
+            from yaml import SafeLoader as loader
+        _YAML_LOADER = loader
+    return _YAML_LOADER
+
+def _parse_json_value(value: str, default=None):
     """
-    解析环境变量，支持多种格式：
+    解析环境变量的值，支持多种格式：
     - JSON格式: '["a", "b"]' 或 '{"a": 1.0, "b": 2.0}'
     - 逗号分隔: 'a, b, c'
     - 单个值: 'a'
     """
-    value = os.environ.get(env_name, '').strip()
+    value = value.strip()
     if not value:
         return default
     
@@ -52,7 +68,88 @@ def _parse_json_env(env_name: str, default=None):
     return value if value else default
 
 
-@dataclass
+# 环境变量处理器返回该值时表示不覆盖配置文件中的设置
+_UNSET = object()
+
+
+@lru_cache(maxsize=64)
+def _parse_json_cached(value: str):
+    """按原始字符串缓存解析结果，环境变量不变时不再重复 json.loads（结果只读共享）"""
+    return _parse_json_value(value, default=[])
+
+
+def _env_list(value: str):
+    """列表/字典类环境变量（JSON、逗号分隔或单个值）"""
+    parsed = _parse_json_cached(value)
+    return parsed if parsed else _UNSET
+
+
+def _env_top_k(value: str):
+    """Top-K，'null' 表示不限制"""
+    return int(value) if value.lower() != 'null' else None
+
+
+def _env_bool(value: str):
+    """布尔值，无法识别时沿用配置文件"""
+    value = value.lower()
+    if value in ('true', '1', 'yes'):
+        return True
+    if value in ('false', '0', 'no'):
+        return False
+    return _UNSET
+
+
+# 配置文件字段：(YAML节, 键, Config字段, 默认值)，默认值为 _UNSET 时使用Config默认值
+_YAML_FIELDS = (
+    ('arxiv', 'categories', 'categories', _UNSET),
+    ('pdf', 'download', 'download_pdf', False),
+    ('pdf', 'timeout', 'pdf_timeout', 60),
+    ('pdf', 'max_size_mb', 'pdf_max_size_mb', 100),
+    ('pdf', 'concurrent_downloads', 'concurrent_downloads', 4),
+    ('logging', 'level', 'log_level', 'INFO'),
+    ('logging', 'rotation', 'enable_log_rotation', True),
+    ('logging', 'max_bytes', 'log_max_bytes', 10 * 1024 * 1024),
+    ('logging', 'backup_count', 'log_backup_count', 5),
+    ('matching', 'keywords', 'keywords', _UNSET),
+    ('matching', 'threshold', 'threshold', 0.5),
+    ('matching', 'top_k', 'top_k', None),
+    ('llm', 'model_name', 'llm_model', 'deepseek-chat'),
+    ('llm', 'api_key', 'llm_api_key', ''),
+    ('llm', 'base_url', 'llm_base_url', 'https://api.deepseek.com'),
+    ('llm', 'batch_size', 'llm_batch_size', 3),
+    ('llm', 'use_batch_api', 'llm_use_batch_api', False),
+    ('email', 'smtp_server', 'email_smtp_server', ''),
+    ('email', 'smtp_port', 'email_smtp_port', 587),
+    ('email', 'sender', 'email_sender', ''),
+    ('email', 'password', 'email_password', ''),
+    ('email', 'recipients', 'email_recipients', _UNSET),
+    ('email', 'use_ssl', 'email_use_ssl', False),
+)
+
+# 环境变量 -> (Config字段, 解析函数)，未设置或为空字符串的环境变量不参与覆盖
+_ENV_HANDLERS = {
+    'ARXIV_CATEGORIES': ('categories', _env_list),
+    'MATCHING_KEYWORDS': ('keywords', _env_list),
+    'MATCHING_THRESHOLD': ('threshold', float),
+    'MATCHING_TOP_K': ('top_k', _env_top_k),
+    'LLM_MODEL': ('llm_model', str),
+    'LLM_BASE_URL': ('llm_base_url', str),
+    'LLM_API_KEY': ('llm_api_key', str),
+    'LLM_BATCH_SIZE': ('llm_batch_size', int),
+    'LLM_USE_BATCH_API': ('llm_use_batch_api', _env_bool),
+    'EMAIL_SMTP_SERVER': ('email_smtp_server', str),
+    'EMAIL_SMTP_PORT': ('email_smtp_port', int),
+    'EMAIL_SENDER': ('email_sender', str),
+    'EMAIL_PASSWORD': ('email_password', str),
+    'EMAIL_RECIPIENTS': ('email_recipients', _env_list),
+    'EMAIL_USE_SSL': ('email_use_ssl', _env_bool),
+}
+
+# 上述环境变量的前缀，遍历环境变量时先按前缀快速筛选
+_ENV_PREFIXES = tuple(sorted({name.split('_', 1)[0] + '_' for name in _ENV_HANDLERS}))
+
+
+@dataclass(slots=True)
 class Config:
     """配置类"""
     # arXiv分类
@@ -80,7 +177,8 @@ class Config:
     top_k: Optional[int] = None  # 最大论文数量限制（None表示不限制）
     
     # LLM批量处理配置
-    llm_batch_size: int = 3  # 每次LLM调用处理的论文数量
+    llm_batch_size: int = 3  # 每次LLM调用处理的论文数量上限（按摘要长度自动调整，最多8篇）
+    llm_use_batch_api: bool = False  # 通过 Batch API 提交（费用约减半，最长等待24小时，不支持时回退到实时调用）
     
     # LLM配置
     llm_model: str = "deepseek-chat"
@@ -105,10 +203,70 @@ class Config:
         return os.path.join(self.log_dir, f"{name}.log")
 
 
+def _json_cache_path(yaml_path: str) -> str:
+    """YAML配置对应的JSON缓存文件路径"""
+    return yaml_path + '.cache.json'
+
+
+def _read_json_cache(yaml_path: str, mtime_ns: int) -> Optional[dict]:
+    """读取JSON缓存，仅当缓存记录的YAML修改时间与当前一致时有效"""
+    try:
+        with open(_json_cache_path(yaml_path), 'r', encoding='utf-8') as f:
+            # 缓存中含有API密钥、邮箱密码等敏感信息：其他用户可读的旧缓存视为无效，重新解析后以 0600 权限重写
+            if os.name == 'posix' and os.fstat(f.fileno()).st_mode & 0o077:
+                return None
+            cached = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cached, dict) or cached.get('mtime_ns') != mtime_ns:
+        return None
+    return cached.get('config')
+
+
+def _write_json_cache(yaml_path: str, mtime_ns: int, data: dict):
+    """原子写入JSON缓存，只读目录等写入失败时静默跳过"""
+    try:
+        payload = json.dumps({'mtime_ns': mtime_ns, 'config': data}, ensure_ascii=False)
+    except (TypeError, ValueError):
+        return  # 含有JSON无法表示的类型（如日期），不缓存
+    if json.loads(payload)['config'] != data:
+        return  # JSON往返会改变内容（如非字符串键），不缓存
+    
+    cache_path = _json_cache_path(yaml_path)
+    tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+    try:
+        # 缓存包含配置文件中的密钥，仅当前用户可读写（不受umask影响）
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with open(fd, 'w', encoding='utf-8') as f:
+            f.write(payload)
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+
+
+@lru_cache(maxsize=8)
+def _load_yaml_cached(yaml_path: str, mtime_ns: int) -> dict:
+    """解析YAML文件，按 (路径, 修改时间) 缓存，文件修改后自动失效"""
+    # 优先读取旁路JSON缓存，JSON解析比YAML快得多
+    cached = _read_json_cache(yaml_path, mtime_ns)
+    if cached is not None:
+        return cached
+    
+    import yaml
+    
+    with open(yaml_path, 'r', encoding='utf-8') as f:
+        data = yaml.load(f, Loader=_get_yaml_loader()) or {}
+    _write_json_cache(yaml_path, mtime_ns, data)
+    return data
+
+
 def load_config_from_yaml(yaml_path: str) -> dict:
     """从YAML文件加载配置"""
-    with open(yaml_path, 'r', encoding='utf-8') as f:
-        return yaml.safe_load(f) or {}
+    yaml_path = os.path.abspath(yaml_path)
+    return copy.deepcopy(_load_yaml_cached(yaml_path, os.stat(yaml_path).st_mtime_ns))
 
 
 def _resolve_path(path: str, base_dir: str) -> str:
@@ -131,158 +289,78 @@ def get_config(config_path: Optional[str] = None) -> Config:
     # 默认配置文件路径（项目根目录）
     if config_path is None:
         config_path = os.path.join(os.path.dirname(__file__), "config.yaml")
+    config_path = os.path.abspath(config_path)
     
-    # 加载YAML配置（如果存在）
-    if os.path.exists(config_path):
-        yaml_config = load_config_from_yaml(config_path)
+    try:
+        mtime_ns = os.stat(config_path).st_mtime_ns
         # 获取项目根目录（配置文件所在目录）
-        project_root = os.path.dirname(os.path.abspath(config_path))
-    else:
-        yaml_config = {}  # 配置文件不存在时使用空配置，但继续处理环境变量
+        project_root = os.path.dirname(config_path)
+    except FileNotFoundError:
+        mtime_ns = None
         # 使用当前工作目录作为项目根目录
         project_root = os.getcwd()
     
-    # 构建配置对象
-    config = Config()
-    
-    # ==========================================================================
-    # arXiv配置 - 环境变量优先
-    # ==========================================================================
-    arxiv_config = yaml_config.get('arxiv', {})
-    env_categories = _parse_json_env('ARXIV_CATEGORIES')
-    if env_categories:
-        config.categories = env_categories
-    elif 'categories' in arxiv_config:
-        config.categories = arxiv_config['categories']
+    # 单次遍历环境变量，挑出需要覆盖配置的项（同时作为缓存键，环境变量变化时重新构建）
+    env_items = tuple(
+        (name, value) for name, value in os.environ.items()
+        if name.startswith(_ENV_PREFIXES) and name in _ENV_HANDLERS
+    )
     
-    # ==========================================================================
-    # 数据目录配置（转换为绝对路径）
-    # ==========================================================================
-    data_config = yaml_config.get('data', {})
-    if 'base_dir' in data_config:
-        config.base_data_dir = _resolve_path(data_config['base_dir'], project_root)
+    # 返回副本，调用方修改配置不会影响缓存
+    return copy.deepcopy(_build_config(config_path, mtime_ns, project_root, env_items))
+
+
+@lru_cache(maxsize=8)
+def _build_config(config_path: str, mtime_ns: Optional[int], project_root: str, env_items: tuple) -> Config:
+    """构建配置对象，按 (配置文件, 修改时间, 项目根目录, 环境变量) 缓存"""
+    # 加载YAML配置（如果存在）
+    if mtime_ns is not None:
+        yaml_config = _load_yaml_cached(config_path, mtime_ns)
     else:
-        config.base_data_dir = _resolve_path(config.base_data_dir, project_root)
+        yaml_config = {}  # 配置文件不存在时使用空配置，但继续处理环境变量
+    
+    # 先收集所有字段值，最后一次性构建配置对象（未出现的字段使用Config默认值）
+    overrides = {}
     
     # ==========================================================================
-    # PDF配置（默认禁用）
+    # 配置文件中的普通字段
     # ==========================================================================
-    pdf_config = yaml_config.get('pdf', {})
-    config.download_pdf = pdf_config.get('download', False)
-    config.pdf_timeout = pdf_config.get('timeout', 60)
-    config.pdf_max_size_mb = pdf_config.get('max_size_mb', 100)
-    config.concurrent_downloads = pdf_config.get('concurrent_downloads', 4)
+    for section, key, field_name, default in _YAML_FIELDS:
+        value = (yaml_config.get(section) or {}).get(key, default)
+        if value is not _UNSET:
+            overrides[field_name] = value
     
     # ==========================================================================
-    # 日志配置（转换为绝对路径）
+    # 数据目录和日志目录（转换为绝对路径）
     # ==========================================================================
-    log_config = yaml_config.get('logging', {})
-    if 'dir' in log_config:
-        config.log_dir = _resolve_path(log_config['dir'], project_root)
-    else:
-        config.log_dir = _resolve_path(config.log_dir, project_root)
-    config.log_level = log_config.get('level', 'INFO')
-    config.enable_log_rotation = log_config.get('rotation', True)
-    config.log_max_bytes = log_config.get('max_bytes', 10 * 1024 * 1024)
-    config.log_backup_count = log_config.get('backup_count', 5)
+    data_config = yaml_config.get('data') or {}
+    overrides['base_data_dir'] = _resolve_path(data_config.get('base_dir', './data'), project_root)
+    log_config = yaml_config.get('logging') or {}
+    overrides['log_dir'] = _resolve_path(log_config.get('dir', './logs'), project_root)
     
     # ==========================================================================
-    # 关键词匹配配置 - 环境变量优先
+    # 环境变量覆盖（优先级高于配置文件，未设置任何相关环境变量时跳过）
     # ==========================================================================
-    match_config = yaml_config.get('matching', {})
-    
-    # 关键词（环境变量优先）
-    env_keywords = _parse_json_env('MATCHING_KEYWORDS')
-    if env_keywords:
-        raw_keywords = env_keywords
-    else:
-        raw_keywords = match_config.get('keywords', [])
-    
-    # 解析关键词格式
-    if isinstance(raw_keywords, dict):
-        config.keywords = raw_keywords
-    elif isinstance(raw_keywords, list):
+    if env_items:
+        for name, value in env_items:
+            if not value:
+                continue
+            field_name, parse = _ENV_HANDLERS[name]
+            parsed = parse(value)
+            if parsed is not _UNSET:
+                overrides[field_name] = parsed
+    
+    # 解析关键词格式（支持简单列表或带权重字典）
+    raw_keywords = overrides.get('keywords', [])
+    if isinstance(raw_keywords, list):
         keywords_dict = {}
         for item in raw_keywords:
             if isinstance(item, str):
                 keywords_dict[item] = 1.0
             elif isinstance(item, dict):
                 keywords_dict.update(item)
-        config.keywords = keywords_dict
-    else:
-        config.keywords = {}
-    
-    # 阈值（环境变量优先）
-    env_threshold = os.environ.get('MATCHING_THRESHOLD')
-    if env_threshold:
-        config.threshold = float(env_threshold)
-    else:
-        config.threshold = match_config.get('threshold', 0.5)
-    
-    # Top-K（环境变量优先）
-    env_top_k = os.environ.get('MATCHING_TOP_K')
-    if env_top_k:
-        config.top_k = int(env_top_k) if env_top_k.lower() != 'null' else None
-    else:
-        config.top_k = match_config.get('top_k', None)
-    
-    # ==========================================================================
-    # LLM配置 - 环境变量优先
-    # ==========================================================================
-    llm_config = yaml_config.get('llm', {})
+        overrides['keywords'] = keywords_dict
+    elif not isinstance(raw_keywords, dict):
+        overrides['keywords'] = {}
     
-    # 模型名称
-    config.llm_model = os.environ.get('LLM_MODEL') or llm_config.get('model_name', 'deepseek-chat')
-    
-    # API密钥（仅从环境变量读取，安全考虑）
-    config.llm_api_key = os.environ.get('LLM_API_KEY', '') or llm_config.get('api_key', '')
-    
-    # Base URL
-    config.llm_base_url = os.environ.get('LLM_BASE_URL') or llm_config.get('base_url', 'https://api.deepseek.com')
-    
-    # 批量处理大小
-    env_batch_size = os.environ.get('LLM_BATCH_SIZE')
-    if env_batch_size:
-        config.llm_batch_size = int(env_batch_size)
-    else:
-        config.llm_batch_size = llm_config.get('batch_size', 3)
-    
-    # ==========================================================================
-    # 邮件配置 - 环境变量优先
-    # ==========================================================================
-    email_config = yaml_config.get('email', {})
-    
-    # SMTP服务器
-    config.email_smtp_server = os.environ.get('EMAIL_SMTP_SERVER') or email_config.get('smtp_server', '')
-    
-    # SMTP端口
-    env_smtp_port = os.environ.get('EMAIL_SMTP_PORT')
-    if env_smtp_port:
-        config.email_smtp_port = int(env_smtp_port)
-    else:
-        config.email_smtp_port = email_config.get('smtp_port', 587)
-    
-    # 发送方邮箱
-    config.email_sender = os.environ.get('EMAIL_SENDER') or email_config.get('sender', '')
-    
-    # 邮箱密码（仅从环境变量读取，安全考虑）
-    config.email_password = os.environ.get('EMAIL_PASSWORD', '') or email_config.get('password', '')
-    
-    # 收件人列表
-    env_recipients = _parse_json_env('EMAIL_RECIPIENTS')
-    if env_recipients:
-        config.email_recipients = env_recipients
-    else:
-        config.email_recipients = email_config.get('recipients', [])
-    
-    # 是否使用SSL
-    env_use_ssl = os.environ.get('EMAIL_USE_SSL', '').lower()
-    if env_use_ssl in ('true', '1', 'yes'):
-        config.email_use_ssl = True
-    elif env_use_ssl in ('false', '0', 'no'):
-        config.email_use_ssl = False
-    else:
-        config.email_use_ssl = email_config.get('use_ssl', False)
-    
-    return config
-
+    return Config(**overrides)
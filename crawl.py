@@ -7,10 +7,15 @@ arXiv论文爬取器 - 独立的论文数据爬取工具
 import os
 import sys
 import subprocess
-import json
 from datetime import datetime
 from pathlib import Path
 
+# JSON解析：优先使用 orjson（可直接解析bytes），未安装时回退到标准库
+try:
+    from orjson import loads as json_loads
+except ImportError:
+    from json import loads as json_loads
+
 from config_loader import get_config
 from logger_setup import setup_logger, get_logger
 
@@ -23,6 +28,9 @@ if project_root not in sys.path:
 # 配置区域
 # =============================================================================
 
+# 显示示例论文时最多读取的字节数（足以容纳一条完整的论文记录）
+SAMPLE_LINE_LIMIT = 64 * 1024
+
 
 class CrawlConfig:
     """爬取配置类"""
@@ -62,16 +70,20 @@ class ArxivCrawler:
         self.logger = get_logger()
         # 记录爬取日期的文件路径
         self.last_crawl_file = Path(self.config.BASE_DATA_DIR) / ".last_crawl_date"
+        # 预先计算每个分类的 (分类, 短名称, jsonl目录, 数据文件)，避免各处重复拆分字符串
+        self._cat_info = []
+        for category in self.config.CATEGORIES:
+            category_short = self._get_category_short(category)
+            jsonl_dir = Path(f"{self.config.BASE_DATA_DIR}/jsonl/{category_short}")
+            self._cat_info.append((category, category_short, jsonl_dir, jsonl_dir / "papers.jsonl"))
         self.setup_environment()
 
     def _get_last_crawl_date(self) -> str:
         """获取上次爬取的日期"""
-        if self.last_crawl_file.exists():
-            try:
-                return self.last_crawl_file.read_text().strip()
-            except Exception:
-                return ""
-        return ""
+        try:
+            return self.last_crawl_file.read_text().strip()
+        except (OSError, UnicodeDecodeError):
+            return ""
 
     def _save_crawl_date(self):
         """保存当前爬取日期"""
@@ -110,14 +122,7 @@ class ArxivCrawler:
 
     def _get_category_short(self, category):
         """提取分类短名称: cs.IR -> IR"""
-        return category.split('.')[-1]
-
-    def _get_category_paths(self, category_short):
-        """获取分类的数据路径（不再按日期区分）"""
-        base = self.config.BASE_DATA_DIR
-        return {
-            'jsonl': f"{base}/jsonl/{category_short}",
-        }
+        return category.rsplit('.', 1)[-1]
 
     def setup_environment(self):
         """设置环境变量和创建目录"""
@@ -126,10 +131,13 @@ class ArxivCrawler:
         os.environ["BASE_DATA_DIR"] = self.config.BASE_DATA_DIR
 
         # 为每个分类创建目录
-        for category in self.config.CATEGORIES:
-            category_short = self._get_category_short(category)
-            paths = self._get_category_paths(category_short)
-            Path(paths['jsonl']).mkdir(parents=True, exist_ok=True)
+        # 所有分类目录共享同一父目录：父目录只创建一次，各分类目录用 mkdir 直接创建，不再逐级检查
+        os.makedirs(f"{self.config.BASE_DATA_DIR}/jsonl", exist_ok=True)
+        for _, _, jsonl_dir, _ in self._cat_info:
+            try:
+                os.mkdir(jsonl_dir)
+            except FileExistsError:
+                pass
 
     def print_config(self):
         """显示当前配置"""
@@ -143,34 +151,31 @@ class ArxivCrawler:
         print(f"   下载PDF: {self.config.DOWNLOAD_PDF}")
         print()
 
-    def _get_data_file(self, category_short):
-        """获取分类的数据文件路径"""
-        paths = self._get_category_paths(category_short)
-        return f"{paths['jsonl']}/papers.jsonl"
-
     def crawl_papers(self):
         """爬取论文数据"""
         print("🚀 开始爬取arXiv论文...")
 
         # 清空所有分类的数据目录
-        for category in self.config.CATEGORIES:
-            category_short = self._get_category_short(category)
-            paths = self._get_category_paths(category_short)
-            jsonl_dir = Path(paths['jsonl'])
-            if jsonl_dir.exists():
-                # 清空目录下所有文件
-                for file in jsonl_dir.glob("*"):
-                    if file.is_file():
-                        print(f"🗑️ 清理旧数据: {file}")
-                        file.unlink()
+        for _, _, jsonl_dir, _ in self._cat_info:
+            # 清空目录下所有文件（scandir 直接使用目录项类型，无需逐个 stat）
+            try:
+                with os.scandir(jsonl_dir) as entries:
+                    for entry in entries:
+                        if entry.is_file():
+                            print(f"🗑️ 清理旧数据: {entry.path}")
+                            os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
 
         # 执行爬取
         try:
             cmd = ["scrapy", "crawl", "arxiv"]
             print(f"执行命令: {' '.join(cmd)}")
 
+            # 只在失败时需要错误输出，stdout 直接丢弃，不在内存中缓存
             subprocess.run(
-                cmd, cwd="crawler", capture_output=True, text=True, check=True
+                cmd, cwd="crawler", stdout=subprocess.DEVNULL,
+                stderr=subprocess.PIPE, text=True, check=True
             )
             print("✅ 爬取完成")
             return True
@@ -202,33 +207,47 @@ class ArxivCrawler:
             print(f"❌ 去重检查异常: {e}")
             return False
 
-    def _print_category_stats(self, category):
+    @staticmethod
+    def _count_lines(file_path):
+        """按块读取二进制内容统计行数，避免逐行解码"""
+        count = 0
+        last = b""
+        with open(file_path, 'rb') as f:
+            while True:
+                buf = f.read(1 << 20)
+                if not buf:
+                    break
+                count += buf.count(b'\n')
+                last = buf
+        # 最后一行没有换行符时也计入
+        if last and not last.endswith(b'\n'):
+            count += 1
+        return count
+
+    def _print_category_stats(self, cat_info):
         """打印单个分类的统计信息"""
-        category_short = self._get_category_short(category)
-        paths = self._get_category_paths(category_short)
-        data_file = self._get_data_file(category_short)
+        category, _, jsonl_dir, data_file = cat_info
 
         print(f"\n📁 {category} 分类结果:")
-        print(f"   📂 数据目录: {paths['jsonl']}/")
+        print(f"   📂 数据目录: {jsonl_dir}/")
 
         # 统计论文数
         if os.path.exists(data_file):
-            with open(data_file, 'r') as f:
-                count = sum(1 for _ in f)
+            count = self._count_lines(data_file)
             print(f"   ✅ 论文数据: {os.path.basename(data_file)} ({count} 篇)")
 
-    def _print_sample_paper(self, category):
+    def _print_sample_paper(self, cat_info):
         """打印单个分类的示例论文"""
-        category_short = self._get_category_short(category)
-        data_file = self._get_data_file(category_short)
+        category, _, _, data_file = cat_info
 
         if not os.path.exists(data_file):
             return
 
         print(f"\n📝 {category} 示例论文:")
         try:
-            with open(data_file, 'r', encoding='utf-8') as f:
-                sample = json.loads(f.readline())
+            # 只读取第一行，并限制读取长度，避免超长行的额外I/O和解码
+            with open(data_file, 'rb') as f:
+                sample = json_loads(f.readline(SAMPLE_LINE_LIMIT))
                 print(f"   ID: {sample.get('id', 'N/A')}")
                 print(f"   标题: {sample.get('title', 'N/A')[:80]}...")
                 print(f"   作者: {', '.join(sample.get('authors', [])[:3])}...")
@@ -242,12 +261,12 @@ class ArxivCrawler:
         print("=" * 60)
 
         # 显示每个分类的统计信息
-        for category in self.config.CATEGORIES:
-            self._print_category_stats(category)
+        for cat_info in self._cat_info:
+            self._print_category_stats(cat_info)
 
         # 显示示例论文
-        for category in self.config.CATEGORIES:
-            self._print_sample_paper(category)
+        for cat_info in self._cat_info:
+            self._print_sample_paper(cat_info)
 
     def run(self, force: bool = False):
         """
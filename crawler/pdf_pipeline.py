@@ -2,11 +2,25 @@
 PDF下载和验证管道
 """
 import os
-import requests
 import hashlib
 import logging
+import mmap
+import threading
 from datetime import datetime
 
+# 文件哈希仅用于标识文件，无需兼容MD5：优先使用SIMD加速的BLAKE3，未安装时回退到SHA-256
+try:
+    from blake3 import blake3 as _file_hash
+    HASH_ALGORITHM = 'blake3'
+except ImportError:
+    from hashlib import sha256 as _file_hash
+    HASH_ALGORITHM = 'sha256'
+
+# 计算哈希时每次读取的块大小
+HASH_CHUNK_SIZE = 1024 * 1024
+# 下载PDF时每次读取的块大小
+DOWNLOAD_CHUNK_SIZE = 1024 * 1024
+
 logger = logging.getLogger(__name__)
 
 # 用于跟踪PDF下载统计
@@ -16,20 +30,33 @@ _download_stats = {
     'failed': 0,
     'skipped': 0
 }
+# 下载在线程池中并发执行，统计计数需要加锁
+_stats_lock = threading.Lock()
+
+
+def _count_stat(key):
+    """线程安全地累加下载统计"""
+    with _stats_lock:
+        _download_stats[key] += 1
 
 
 class PDFDownloadPipeline:
     """PDF下载管道 - 下载arXiv论文的PDF文件"""
 
-    def __init__(self, base_dir='../data', download_timeout=30, max_file_size=50 * 1024 * 1024):
+    def __init__(self, base_dir='../data', download_timeout=30, max_file_size=50 * 1024 * 1024,
+                 concurrent_downloads=4):
         """初始化PDF下载管道"""
         self.base_dir = base_dir
         self.download_timeout = download_timeout
         self.max_file_size = max_file_size
+        self.concurrent_downloads = max(1, int(concurrent_downloads))
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36',
             'Accept': 'application/pdf,application/octet-stream,*/*',
         }
+        self._session = None
+        self._session_lock = threading.Lock()  # 下载线程并发首次获取会话时只创建一个
+        self._thread_pool = None
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -40,8 +67,41 @@ class PDFDownloadPipeline:
             base_dir=base_dir,
             download_timeout=settings.get('PDF_DOWNLOAD_TIMEOUT', 30),
             max_file_size=settings.get('PDF_MAX_FILE_SIZE', 50 * 1024 * 1024),
+            concurrent_downloads=settings.getint('PDF_CONCURRENT_DOWNLOADS', 4),
         )
 
+    def open_spider(self, spider):
+        """爬虫启动时创建下载线程池"""
+        if self.concurrent_downloads > 1 and getattr(spider, 'download_pdf', True):
+            from twisted.python.threadpool import ThreadPool
+            self._thread_pool = ThreadPool(
+                minthreads=0, maxthreads=self.concurrent_downloads, name='pdf-download'
+            )
+            self._thread_pool.start()
+
+    def _get_session(self):
+        """获取复用连接的HTTP会话（首次使用时创建，线程安全）"""
+        session = self._session
+        if session is not None:
+            return session
+        with self._session_lock:
+            if self._session is None:
+                # 延迟导入：PDF下载默认禁用，未启用时无需加载 requests
+                import requests
+                from requests.adapters import HTTPAdapter
+
+                session = requests.Session()
+                session.headers.update(self.headers)
+                # 连接池大小与并发下载数一致，避免keep-alive连接被丢弃后重新握手
+                adapter = HTTPAdapter(
+                    pool_connections=self.concurrent_downloads,
+                    pool_maxsize=self.concurrent_downloads,
+                )
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self._session = session
+            return self._session
+
     def _get_pdf_path(self, item):
         """获取PDF存储路径"""
         if not item.get('categories'):
@@ -56,27 +116,26 @@ class PDFDownloadPipeline:
 
     def process_item(self, item, spider):
         """处理每个item，下载PDF文件"""
-        global _download_stats
-        _download_stats['total'] += 1
+        _count_stat('total')
 
         # 检查是否需要下载PDF
         if not getattr(spider, 'download_pdf', True):
             logger.info(f"PDF下载已禁用，跳过 {item['id']}")
-            _download_stats['skipped'] += 1
+            _count_stat('skipped')
             return item
 
         pdf_url = item.get('pdf')
         if not pdf_url:
             logger.warning(f"论文 {item['id']} 没有PDF URL")
             item['pdf_download_status'] = 'no_url'
-            _download_stats['skipped'] += 1
+            _count_stat('skipped')
             return item
 
         try:
             local_path = self._get_pdf_path(item)
             if not local_path:
                 item['pdf_download_status'] = 'no_category'
-                _download_stats['skipped'] += 1
+                _count_stat('skipped')
                 return item
 
             # 检查文件是否已存在
@@ -84,27 +143,45 @@ class PDFDownloadPipeline:
                 logger.info(f"PDF文件已存在: {local_path}")
                 item['pdf_local_path'] = local_path
                 item['pdf_download_status'] = 'already_exists'
-                _download_stats['skipped'] += 1
+                _count_stat('skipped')
                 return item
 
-            # 下载PDF文件
+        except Exception as e:
+            return self._mark_error(item, e)
+
+        # 下载为I/O密集型任务：线程池可用时在后台线程下载，返回Deferred由Scrapy等待结果
+        if self._thread_pool is not None:
+            from twisted.internet import reactor
+            from twisted.internet.threads import deferToThreadPool
+            return deferToThreadPool(
+                reactor, self._thread_pool, self._download_item, item, pdf_url, local_path
+            )
+        return self._download_item(item, pdf_url, local_path)
+
+    def _download_item(self, item, pdf_url, local_path):
+        """下载单篇论文的PDF并记录结果"""
+        try:
             logger.info(f"开始下载PDF: {pdf_url}")
             if self._download_pdf(pdf_url, local_path):
                 item['pdf_local_path'] = local_path
                 item['pdf_download_status'] = 'success'
                 logger.info(f"✅ PDF下载成功: {local_path}")
-                _download_stats['success'] += 1
+                _count_stat('success')
             else:
                 item['pdf_download_status'] = 'failed'
                 logger.error(f"❌ PDF下载失败: {pdf_url}")
-                _download_stats['failed'] += 1
-
+                _count_stat('failed')
         except Exception as e:
-            logger.error(f"处理PDF下载时出错 {item['id']}: {str(e)}")
-            item['pdf_download_status'] = 'error'
-            item['pdf_error'] = str(e)
-            _download_stats['failed'] += 1
+            return self._mark_error(item, e)
+
+        return item
 
+    def _mark_error(self, item, error):
+        """记录PDF处理异常"""
+        logger.error(f"处理PDF下载时出错 {item['id']}: {str(error)}")
+        item['pdf_download_status'] = 'error'
+        item['pdf_error'] = str(error)
+        _count_stat('failed')
         return item
 
     def _validate_response(self, response, url):
@@ -139,10 +216,11 @@ class PDFDownloadPipeline:
 
     def _download_pdf(self, url, local_path):
         """下载PDF文件"""
+        import requests
+
         try:
-            response = requests.get(
-                url, headers=self.headers,
-                timeout=self.download_timeout, stream=True
+            response = self._get_session().get(
+                url, timeout=self.download_timeout, stream=True
             )
             response.raise_for_status()
 
@@ -150,18 +228,24 @@ class PDFDownloadPipeline:
             if not self._validate_response(response, url):
                 return False
 
-            # 下载文件
+            # 下载文件：直接按1MB块读取底层连接，减少Python层循环次数，同时保留超限提前中止
             downloaded_size = 0
+            raw = response.raw
             with open(local_path, 'wb') as f:
-                for chunk in response.iter_content(chunk_size=8192):
-                    if chunk:
-                        f.write(chunk)
-                        downloaded_size += len(chunk)
-
-                        if downloaded_size > self.max_file_size:
-                            logger.error(f"下载文件过大: {url}")
-                            os.remove(local_path)
-                            return False
+                while True:
+                    chunk = raw.read(DOWNLOAD_CHUNK_SIZE, decode_content=True)
+                    if not chunk:
+                        break
+                    f.write(chunk)
+                    downloaded_size += len(chunk)
+
+                    if downloaded_size > self.max_file_size:
+                        logger.error(f"下载文件过大: {url}")
+                        break
+
+            if downloaded_size > self.max_file_size:
+                os.remove(local_path)
+                return False
 
             # 验证下载的文件
             if not self._validate_downloaded_file(local_path):
@@ -178,8 +262,14 @@ class PDFDownloadPipeline:
             return False
 
     def close_spider(self, spider):
-        """爬虫关闭时输出统计信息"""
-        global _download_stats
+        """爬虫关闭时释放线程池和连接，并输出统计信息"""
+        if self._thread_pool is not None:
+            self._thread_pool.stop()
+            self._thread_pool = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
         logger.info(
             f"PDF下载统计: 总计={_download_stats['total']}, "
             f"成功={_download_stats['success']}, "
@@ -199,7 +289,9 @@ class PDFValidationPipeline:
 
         try:
             item['pdf_file_size'] = os.path.getsize(pdf_path)
-            item['pdf_md5'] = self._calculate_md5(pdf_path)
+            item['pdf_hash'] = self._calculate_hash(pdf_path)
+            item['pdf_hash_algorithm'] = HASH_ALGORITHM
+            item['pdf_md5'] = item['pdf_hash']  # 兼容旧字段名
             item['pdf_is_valid'] = self._validate_pdf(pdf_path)
 
             if not item['pdf_is_valid']:
@@ -211,25 +303,28 @@ class PDFValidationPipeline:
 
         return item
 
-    def _calculate_md5(self, file_path):
-        """计算文件MD5哈希"""
-        hash_md5 = hashlib.md5()
+    def _calculate_hash(self, file_path):
+        """计算文件哈希（BLAKE3 或 SHA-256）"""
         with open(file_path, "rb") as f:
-            for chunk in iter(lambda: f.read(4096), b""):
-                hash_md5.update(chunk)
-        return hash_md5.hexdigest()
+            # Python 3.11+: file_digest 复用同一缓冲区 readinto，不为每个分块分配新的 bytes
+            if hasattr(hashlib, 'file_digest'):
+                return hashlib.file_digest(f, _file_hash).hexdigest()
+            file_hash = _file_hash()
+            for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+                file_hash.update(chunk)
+        return file_hash.hexdigest()
 
     def _validate_pdf(self, file_path):
         """验证PDF文件"""
         try:
-            with open(file_path, 'rb') as f:
+            # 通过mmap直接访问页缓存，文件头和尾部检查无需额外的seek/read
+            with open(file_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
                 # 检查PDF文件头
-                if not f.read(8).startswith(b'%PDF-'):
+                if mm[:5] != b'%PDF-':
                     return False
 
-                # 检查EOF标记
-                f.seek(-1024, 2)
-                if b'%%EOF' not in f.read():
+                # 检查EOF标记（最后1024字节内）
+                if mm.rfind(b'%%EOF', max(0, len(mm) - 1024)) == -1:
                     logger.warning(f"PDF文件可能不完整（缺少EOF标记）: {file_path}")
                     return False
 
@@ -3,36 +3,170 @@
 """
 import arxiv
 import os
+import re
 import json
+import logging
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
+from scrapy.exceptions import DropItem
+from twisted.internet.defer import Deferred
+
+# JSON序列化：优先使用 orjson（直接输出UTF-8 bytes，保留非ASCII字符），未安装时回退到标准库
+try:
+    from orjson import dumps as _orjson_dumps
+
+    def _dump_line(item):
+        return _orjson_dumps(item) + b'\n'
+except ImportError:
+    def _dump_line(item):
+        return (json.dumps(item, ensure_ascii=False) + '\n').encode('utf-8')
+
+logger = logging.getLogger(__name__)
+
+# 每次向arXiv API批量查询的论文数（与 Client 的 page_size 一致，一批只需一次请求）
+METADATA_BATCH_SIZE = 100
+# 未攒满一批时，自该批第一篇论文到达起最多等待的秒数（之后按不完整的批次提交）
+METADATA_FLUSH_DELAY = 2.0
+
+# 并发获取元数据的线程数，以及arXiv要求的相邻请求最小间隔（秒）
+METADATA_FETCH_WORKERS = 4
+ARXIV_REQUEST_INTERVAL = 3.0
+
+# JSONL文件写缓冲大小，以及定期落盘的写入条数（兼顾吞吐与异常退出时的数据完整性）
+WRITE_BUFFER_SIZE = 1024 * 1024
+FLUSH_EVERY_WRITES = 50
+
+# 同时保持打开的文件句柄上限，超过时关闭最久未使用的句柄
+MAX_OPEN_FILES = 32
+
+# arXiv ID 末尾的版本号，如 2401.12345v2 中的 v2
+_VERSION_SUFFIX = re.compile(r'v\d+$')
+
+
+def _strip_version(arxiv_id):
+    """去掉arXiv ID的版本号后缀"""
+    return _VERSION_SUFFIX.sub('', arxiv_id)
+
+
+class _RateLimiter:
+    """多线程共享的限速器：保证相邻两次请求的间隔不小于 interval 秒"""
+
+    def __init__(self, interval):
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._next_time = 0.0
+
+    def wait(self):
+        """阻塞直到允许发出下一次请求"""
+        with self._lock:
+            now = time.monotonic()
+            delay = self._next_time - now
+            self._next_time = max(now, self._next_time) + self.interval
+        if delay > 0:
+            time.sleep(delay)
+
 
 class DailyArxivPipeline:
-    """arXiv论文数据处理管道"""
+    """
+    arXiv论文数据处理管道
+
+    process_item 返回 Deferred：所属批次的元数据获取并保存到JSONL后，以补全后的条目触发，
+    后续管道收到的条目包含 pdf/abs/pdf_urls 以及 title、summary、authors、comment 和
+    arXiv API 返回的 categories（主分类在前）。未获取到元数据的条目以 DropItem 丢弃。
+    """
 
     def __init__(self):
-        self.client = arxiv.Client(page_size=100)
         self.today = os.environ.get('TARGET_DATE', datetime.now().strftime("%Y-%m-%d"))
         self.base_dir = os.environ.get('BASE_DATA_DIR', '../data')
-        self.category_files = {}  # 缓存文件句柄
-
-    def _fetch_paper_metadata(self, arxiv_id):
-        """从arXiv API获取论文元数据"""
-        search = arxiv.Search(id_list=[arxiv_id])
-        paper = next(self.client.results(search))
-        return {
-            'authors': [a.name for a in paper.authors],
-            'title': paper.title,
-            'categories': paper.categories,
-            'comment': paper.comment,
-            'summary': paper.summary
-        }
+        self.category_files = OrderedDict()  # 缓存文件句柄（按最近使用排序）
+        self._category_paths = {}  # 分类 -> 文件路径
+        self._known_dirs = set()  # 已创建的目录
+        self._writes_since_flush = 0
+        self.pending_items = []  # 等待批量获取元数据的论文：(条目, Deferred)
+        self._flush_call = None  # 未攒满一批时的定时提交
+        # 元数据请求在线程池中并发执行，所有线程共享同一限速器以遵守arXiv的请求频率限制
+        self._executor = ThreadPoolExecutor(
+            max_workers=METADATA_FETCH_WORKERS, thread_name_prefix='arxiv-metadata'
+        )
+        self._rate_limiter = _RateLimiter(ARXIV_REQUEST_INTERVAL)
+        self._pending_batches = deque()  # 已提交的批次：([(条目, Deferred)], 查询ID, Future)
+
+    def _fetch_papers_metadata(self, arxiv_ids):
+        """从arXiv API批量获取论文元数据，返回 {不含版本号的ID: 元数据}（在工作线程中执行）"""
+        # arxiv.Client 内部记录请求时间，不能跨线程共享，每批使用独立的客户端
+        client = arxiv.Client(page_size=METADATA_BATCH_SIZE, delay_seconds=ARXIV_REQUEST_INTERVAL, num_retries=3)
+        search = arxiv.Search(id_list=arxiv_ids, max_results=len(arxiv_ids))
+        self._rate_limiter.wait()
+        metadata = {}
+        for paper in client.results(search):
+            metadata[_strip_version(paper.get_short_id())] = {
+                'authors': [a.name for a in paper.authors],
+                'title': paper.title,
+                'categories': paper.categories,
+                'comment': paper.comment,
+                'summary': paper.summary
+            }
+        return metadata
+
+    def _flush_pending(self):
+        """将缓存的论文作为一批提交到线程池获取元数据"""
+        if self._flush_call is not None:
+            if self._flush_call.active():
+                self._flush_call.cancel()
+            self._flush_call = None
+        if not self.pending_items:
+            return
+        items, self.pending_items = self.pending_items, []
+
+        arxiv_ids = list(dict.fromkeys(item['id'] for item, _ in items))
+        future = self._executor.submit(self._fetch_papers_metadata, arxiv_ids)
+        self._pending_batches.append((items, arxiv_ids, future))
+        # 批次完成后回到reactor线程保存（文件写入和Deferred触发都只在reactor线程进行）
+        future.add_done_callback(self._on_batch_done)
+
+    def _on_batch_done(self, future):
+        """线程池中的批次完成回调（在工作线程中执行）"""
+        from twisted.internet import reactor
+        reactor.callFromThread(self._save_completed_batches)
+
+    def _save_completed_batches(self, wait=False):
+        """按提交顺序保存已获取元数据的批次（wait=True 时等待所有批次完成）"""
+        while self._pending_batches:
+            items, arxiv_ids, future = self._pending_batches[0]
+            if not wait and not future.done():
+                break
+            self._pending_batches.popleft()
+
+            try:
+                metadata = future.result()
+            except Exception as e:
+                logger.error("❌ 批量获取论文元数据失败（%d 篇）: %s", len(arxiv_ids), e)
+                for item, deferred in items:
+                    deferred.errback(DropItem(f"获取论文 {item['id']} 的元数据失败: {e}"))
+                continue
+
+            for item, deferred in items:
+                paper_metadata = metadata.get(_strip_version(item['id']))
+                if paper_metadata is None:
+                    logger.warning("未获取到论文 %s 的元数据，跳过保存", item['id'])
+                    deferred.errback(DropItem(f"未获取到论文 {item['id']} 的元数据"))
+                    continue
+                item.update(paper_metadata)
+                self._save_to_file(item)
+                deferred.callback(item)
 
     def _get_file_path(self, category):
         """获取分类对应的文件路径（不再按日期区分）"""
         category_short = category.split('.')[-1]
         data_dir = f"{self.base_dir}/jsonl/{category_short}"
-        os.makedirs(data_dir, exist_ok=True)
+        # 每个目录只需创建一次
+        if data_dir not in self._known_dirs:
+            os.makedirs(data_dir, exist_ok=True)
+            self._known_dirs.add(data_dir)
         return f"{data_dir}/papers.jsonl"
 
     def process_item(self, item: dict, spider):
@@ -42,37 +176,58 @@ class DailyArxivPipeline:
         item["abs"] = f"https://arxiv.org/abs/{item['id']}"
         item["pdf_urls"] = [item["pdf"]]
 
-        # 获取论文元数据
-        metadata = self._fetch_paper_metadata(item['id'])
-        item.update(metadata)
-
-        # 保存到文件
-        self._save_to_file(item)
-        return item
+        # 元数据按批获取：攒满一批（或等待 METADATA_FLUSH_DELAY 秒）后统一查询，
+        # 补全并保存后再交给后续管道
+        deferred = Deferred()
+        self.pending_items.append((item, deferred))
+        if len(self.pending_items) >= METADATA_BATCH_SIZE:
+            self._flush_pending()
+        elif self._flush_call is None:
+            from twisted.internet import reactor
+            self._flush_call = reactor.callLater(METADATA_FLUSH_DELAY, self._flush_pending)
+        return deferred
 
     def _save_to_file(self, item):
         """保存论文数据到对应分类的文件"""
         if not item.get('categories'):
-            print(f"警告: 论文 {item['id']} 没有分类信息")
+            logger.warning("论文 %s 没有分类信息", item['id'])
             return
 
         # 使用主分类
         primary_category = item['categories'][0]
-        file_path = self._get_file_path(primary_category)
+        file_path = self._category_paths.get(primary_category)
+        if file_path is None:
+            file_path = self._category_paths[primary_category] = self._get_file_path(primary_category)
+
+        # 打开或复用文件句柄（1MB写缓冲，定期及关闭时落盘）
+        file_handle = self.category_files.get(file_path)
+        if file_handle is None:
+            if len(self.category_files) >= MAX_OPEN_FILES:
+                _, evicted = self.category_files.popitem(last=False)
+                evicted.close()
+            file_handle = self.category_files[file_path] = open(file_path, 'ab', buffering=WRITE_BUFFER_SIZE)
+        else:
+            self.category_files.move_to_end(file_path)
 
-        # 打开或复用文件句柄
-        if file_path not in self.category_files:
-            self.category_files[file_path] = open(file_path, 'a', encoding='utf-8')
+        # 整行一次写入（UTF-8编码的bytes）
+        file_handle.write(_dump_line(item))
+        self._writes_since_flush += 1
+        if self._writes_since_flush >= FLUSH_EVERY_WRITES:
+            self._flush_files()
 
-        # 写入数据
-        json.dump(item, self.category_files[file_path], ensure_ascii=False)
-        self.category_files[file_path].write('\n')
-        self.category_files[file_path].flush()
+        logger.info("✅ 保存论文 %s 到 %s", item['id'], file_path)
 
-        print(f"✅ 保存论文 {item['id']} 到 {file_path}")
+    def _flush_files(self):
+        """将所有文件句柄的缓冲写入磁盘"""
+        for file_handle in self.category_files.values():
+            file_handle.flush()
+        self._writes_since_flush = 0
 
     def close_spider(self, spider):
-        """关闭所有文件句柄"""
+        """保存剩余论文并关闭所有文件句柄"""
+        self._flush_pending()
+        self._save_completed_batches(wait=True)
+        self._executor.shutdown()
         for file_handle in self.category_files.values():
             file_handle.close()
         self.category_files.clear()
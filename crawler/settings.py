@@ -25,6 +25,7 @@ ITEM_PIPELINES = {
 # ============================================================================
 PDF_DOWNLOAD_TIMEOUT = 60                           # 下载超时时间（秒）
 PDF_MAX_FILE_SIZE = 100 * 1024 * 1024              # 最大文件大小（100MB）
+PDF_CONCURRENT_DOWNLOADS = 4                        # 并发下载数（同时作为连接池大小）
 
 # ============================================================================
 # 并发和延迟配置
@@ -4,49 +4,35 @@
 import smtplib
 import ssl
 import time
+import hashlib
+import threading
 from email.mime.text import MIMEText
 from email.mime.multipart import MIMEMultipart
 from typing import List
-import markdown
+from functools import lru_cache
 
+# Markdown渲染：优先使用 mistune（解析更快），未安装时回退到 markdown 库
+try:
+    import mistune
+except ImportError:
+    mistune = None
+    import markdown
 
-class EmailSender:
-    """邮件发送器"""
-    
-    def __init__(
-        self,
-        smtp_server: str,
-        smtp_port: int = 587,
-        sender_email: str = "",
-        password: str = "",
-        use_ssl: bool = False
-    ):
-        """
-        初始化邮件发送器
-        
-        Args:
-            smtp_server: SMTP服务器地址
-            smtp_port: SMTP端口
-            sender_email: 发送方邮箱
-            password: 邮箱密码或授权码
-            use_ssl: 是否使用SSL（端口465使用SSL，587使用STARTTLS）
-        """
-        self.smtp_server = smtp_server
-        self.smtp_port = smtp_port
-        self.sender_email = sender_email
-        self.password = password
-        self.use_ssl = use_ssl or smtp_port == 465
-    
-    def _markdown_to_html(self, md_content: str) -> str:
-        """将Markdown转换为HTML，生成简洁大气的邮件样式"""
-        # 使用markdown库转换
-        html = markdown.markdown(
-            md_content,
-            extensions=['tables', 'fenced_code', 'nl2br']
-        )
-        
-        # 简洁大气的样式
-        styled_html = f"""
+
+# 单个SMTP连接最多发送的邮件数，超过后重新建立连接
+MAX_MESSAGES_PER_CONNECTION = 100
+
+# 每个发送器最多缓存的邮件数
+MESSAGE_CACHE_SIZE = 8
+
+# 纯文本判断：包含任一字符时视为Markdown
+_MARKDOWN_CHARS = frozenset('#*_`[]|>')
+
+# 空内容对应的HTML
+_EMPTY_HTML = "<html><body><p>（无内容）</p></body></html>"
+
+# 简洁大气的邮件样式模板（{html} 处填入正文）
+_HTML_TEMPLATE = """
 <!DOCTYPE html>
 <html>
 <head>
@@ -216,7 +202,153 @@ class EmailSender:
 </body>
 </html>
 """
-        return styled_html
+
+
+if mistune is not None:
+    # hard_wrap 对应 nl2br：单个换行渲染为 <br />；每次调用使用独立的解析状态，可并发调用
+    _convert_markdown = mistune.create_markdown(
+        escape=False, hard_wrap=True, plugins=['table', 'strikethrough']
+    )
+else:
+    # 共享的Markdown解析器（扩展只加载一次），实例有内部状态，转换时需加锁
+    _MD = markdown.Markdown(extensions=['tables', 'fenced_code', 'nl2br'])
+    _MD_LOCK = threading.Lock()
+
+    def _convert_markdown(md_content: str) -> str:
+        with _MD_LOCK:
+            return _MD.reset().convert(md_content)
+
+
+@lru_cache(maxsize=8)
+def _render(md_content: str) -> str:
+    """将Markdown渲染为带样式的HTML（同一内容重复发送时直接复用结果）"""
+    html = _convert_markdown(md_content)
+    return _HTML_TEMPLATE.format(html=html)
+
+
+class EmailSender:
+    """邮件发送器"""
+    
+    def __init__(
+        self,
+        smtp_server: str,
+        smtp_port: int = 587,
+        sender_email: str = "",
+        password: str = "",
+        use_ssl: bool = False
+    ):
+        """
+        初始化邮件发送器
+        
+        Args:
+            smtp_server: SMTP服务器地址
+            smtp_port: SMTP端口
+            sender_email: 发送方邮箱
+            password: 邮箱密码或授权码
+            use_ssl: 是否使用SSL（端口465使用SSL，587使用STARTTLS）
+        """
+        self.smtp_server = smtp_server
+        self.smtp_port = smtp_port
+        self.sender_email = sender_email
+        self.password = password
+        self.use_ssl = use_ssl or smtp_port == 465
+        self._server = None  # 复用的SMTP连接
+        self._sent_on_connection = 0  # 当前连接已发送的邮件数
+        self._message_cache = {}  # (主题, 内容哈希, 是否Markdown) -> 邮件对象
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+    
+    def _connect(self):
+        """获取已登录的SMTP连接（复用已有连接，单连接发送数达到上限时重连）"""
+        if self._server is not None and self._sent_on_connection >= MAX_MESSAGES_PER_CONNECTION:
+            self.close()
+        
+        if self._server is None:
+            if self.use_ssl:
+                # SSL连接
+                context = ssl.create_default_context()
+                server = smtplib.SMTP_SSL(
+                    self.smtp_server, 
+                    self.smtp_port, 
+                    context=context,
+                    timeout=30  # 30秒超时
+                )
+            else:
+                # STARTTLS连接
+                server = smtplib.SMTP(
+                    self.smtp_server, 
+                    self.smtp_port,
+                    timeout=30  # 30秒超时
+                )
+            try:
+                if not self.use_ssl:
+                    server.starttls()
+                server.login(self.sender_email, self.password)
+            except Exception:
+                server.close()
+                raise
+            self._server = server
+            self._sent_on_connection = 0
+        
+        return self._server
+    
+    def _reset_connection(self):
+        """丢弃可能已失效的连接（不发送QUIT），下次发送时重新连接"""
+        if self._server is not None:
+            try:
+                self._server.close()
+            except Exception:
+                pass
+            self._server = None
+    
+    def close(self):
+        """关闭SMTP连接"""
+        if self._server is not None:
+            # 安全关闭连接
+            try:
+                self._server.quit()
+            except Exception:
+                self._reset_connection()
+            self._server = None
+    
+    def _markdown_to_html(self, md_content: str) -> str:
+        """将Markdown转换为HTML，生成简洁大气的邮件样式"""
+        # 空内容无需解析和套用样式模板
+        if not md_content.strip():
+            return _EMPTY_HTML
+        return _render(md_content)
+    
+    def _get_message(self, subject: str, content: str, is_markdown: bool) -> MIMEMultipart:
+        """获取邮件对象，按 (主题, 内容哈希, 格式) 缓存，收件人由调用方设置"""
+        content_hash = hashlib.blake2b(content.encode('utf-8'), digest_size=16).hexdigest()
+        key = (subject, content_hash, is_markdown)
+        message = self._message_cache.get(key)
+        if message is not None:
+            return message
+        
+        message = MIMEMultipart("alternative")
+        message["Subject"] = subject
+        message["From"] = self.sender_email
+        message["To"] = ""
+        
+        # 纯文本版本
+        text_part = MIMEText(content, "plain", "utf-8")
+        message.attach(text_part)
+        
+        # HTML版本（如果是Markdown）
+        if is_markdown:
+            html_content = self._markdown_to_html(content)
+            html_part = MIMEText(html_content, "html", "utf-8")
+            message.attach(html_part)
+        
+        if len(self._message_cache) >= MESSAGE_CACHE_SIZE:
+            self._message_cache.pop(next(iter(self._message_cache)))
+        self._message_cache[key] = message
+        return message
     
     def send_email(
         self,
@@ -243,62 +375,34 @@ class EmailSender:
             print("❌ 邮件配置不完整")
             return False
         
-        # 创建邮件（在重试循环外创建，避免重复工作）
-        message = MIMEMultipart("alternative")
-        message["Subject"] = subject
-        message["From"] = self.sender_email
-        message["To"] = ", ".join(recipients)
+        # 不含任何Markdown标记的纯ASCII文本无需生成HTML版本
+        if is_markdown and content.isascii() and _MARKDOWN_CHARS.isdisjoint(content):
+            is_markdown = False
         
-        # 纯文本版本
-        text_part = MIMEText(content, "plain", "utf-8")
-        message.attach(text_part)
+        # 创建邮件（在重试循环外创建，避免重复工作；同一内容发给多批收件人时复用邮件正文）
+        message = self._get_message(subject, content, is_markdown)
+        message.replace_header("To", ", ".join(recipients))
         
-        # HTML版本（如果是Markdown）
-        if is_markdown:
-            html_content = self._markdown_to_html(content)
-            html_part = MIMEText(html_content, "html", "utf-8")
-            message.attach(html_part)
+        # 只序列化一次，重试时直接复用：与 send_message 相同，直接生成CRLF换行的bytes，
+        # sendmail 收到bytes后无需再做换行修正和ASCII编码
+        raw_message = message.as_bytes(policy=message.policy.clone(linesep='\r\n'))
         
-        # 重试发送
+        # 重试发送（复用已建立的连接，连接失效时下次尝试自动重连）
         last_error = None
         for attempt in range(1, max_retries + 1):
             try:
-                server = None
-                try:
-                    if self.use_ssl:
-                        # SSL连接
-                        context = ssl.create_default_context()
-                        server = smtplib.SMTP_SSL(
-                            self.smtp_server, 
-                            self.smtp_port, 
-                            context=context,
-                            timeout=30  # 30秒超时
-                        )
-                    else:
-                        # STARTTLS连接
-                        server = smtplib.SMTP(
-                            self.smtp_server, 
-                            self.smtp_port,
-                            timeout=30  # 30秒超时
-                        )
-                        server.starttls()
-                    
-                    server.login(self.sender_email, self.password)
-                    server.sendmail(self.sender_email, recipients, message.as_string())
-                    print(f"✅ 邮件发送成功，收件人: {', '.join(recipients)}")
-                    return True
-                finally:
-                    # 安全关闭连接
-                    if server:
-                        try:
-                            server.quit()
-                        except Exception:
-                            pass
+                server = self._connect()
+                server.sendmail(self.sender_email, recipients, raw_message)
+                self._sent_on_connection += 1
+                print(f"✅ 邮件发送成功，收件人: {', '.join(recipients)}")
+                return True
                 
             except smtplib.SMTPAuthenticationError:
+                self._reset_connection()
                 print("❌ 邮箱认证失败，请检查用户名和密码/授权码")
                 return False  # 认证失败不重试
             except (smtplib.SMTPException, OSError, ConnectionError) as e:
+                self._reset_connection()
                 last_error = e
                 if attempt < max_retries:
                     wait_time = attempt * 5  # 递增等待时间
@@ -308,6 +412,7 @@ class EmailSender:
                 else:
                     print(f"❌ SMTP错误: {e}")
             except Exception as e:
+                self._reset_connection()
                 last_error = e
                 if attempt < max_retries:
                     wait_time = attempt * 5
@@ -346,20 +451,19 @@ def send_paper_digest(
     Returns:
         是否发送成功
     """
-    sender = EmailSender(
+    subject = f"arXiv论文日报 - {date}"
+    
+    with EmailSender(
         smtp_server=smtp_server,
         smtp_port=smtp_port,
         sender_email=sender_email,
         password=password,
         use_ssl=use_ssl
-    )
-    
-    subject = f"arXiv论文日报 - {date}"
-    
-    return sender.send_email(
-        recipients=recipients,
-        subject=subject,
-        content=digest_content,
-        is_markdown=True
-    )
+    ) as sender:
+        return sender.send_email(
+            recipients=recipients,
+            subject=subject,
+            content=digest_content,
+            is_markdown=True
+        )
 
@@ -3,12 +3,68 @@
 """
 import logging
 import os
+from functools import lru_cache
 from logging.handlers import RotatingFileHandler
 from typing import Optional
 
 # 全局日志实例
 _logger: Optional[logging.Logger] = None
 
+# 日志文件写缓冲大小
+LOG_BUFFER_SIZE = 64 * 1024
+
+
+class BufferedRotatingFileHandler(RotatingFileHandler):
+    """
+    带写缓冲的轮转日志handler
+    
+    普通日志先写入64KB缓冲区，ERROR及以上级别、轮转或关闭时才落盘；
+    轮转判断基于已写入字节数，不再每条日志都 stat/seek 文件（否则缓冲会被立即刷出）。
+    进程正常退出时 logging.shutdown 会刷新所有handler。
+    """
+    
+    def __init__(self, *args, **kwargs):
+        self._bytes_written = 0
+        self._pending_size = 0
+        self._is_regular_file = True
+        self._in_emit = False
+        super().__init__(*args, **kwargs)
+    
+    def _open(self):
+        stream = open(
+            self.baseFilename, self.mode, encoding=self.encoding,
+            errors=self.errors, buffering=LOG_BUFFER_SIZE
+        )
+        # 追加模式下从已有文件大小开始计数；只轮转普通文件（同 bpo-45401）
+        self._is_regular_file = os.path.isfile(self.baseFilename)
+        self._bytes_written = os.fstat(stream.fileno()).st_size
+        return stream
+    
+    def shouldRollover(self, record):
+        if self.stream is None:
+            self.stream = self._open()
+        if self.maxBytes <= 0 or not self._is_regular_file:
+            return False
+        msg = "%s\n" % self.format(record)
+        self._pending_size = len(msg.encode(self.encoding or 'utf-8', errors='replace'))
+        return self._bytes_written + self._pending_size >= self.maxBytes
+    
+    def emit(self, record):
+        self._in_emit = True
+        self._pending_size = 0
+        try:
+            super().emit(record)
+            self._bytes_written += self._pending_size
+        finally:
+            self._in_emit = False
+        if record.levelno >= logging.ERROR:
+            self.flush()
+    
+    def flush(self):
+        # StreamHandler.emit 每写一条都会调用 flush，写入过程中跳过，由 emit 决定落盘时机
+        if not self._in_emit:
+            super().flush()
+
 
 def setup_logger(
     name: str = "arxiv_notifier",
@@ -33,7 +89,20 @@ def setup_logger(
         配置好的Logger对象
     """
     global _logger
-    
+    _logger = _configure_logger(name, log_file, level, enable_rotation, max_bytes, backup_count)
+    return _logger
+
+
+@lru_cache(maxsize=16)
+def _configure_logger(
+    name: str,
+    log_file: Optional[str],
+    level: str,
+    enable_rotation: bool,
+    max_bytes: int,
+    backup_count: int
+) -> logging.Logger:
+    """按参数缓存的实际配置逻辑，相同参数重复调用时直接返回已配置的logger"""
     # 创建logger
     logger = logging.getLogger(name)
     logger.setLevel(getattr(logging, level.upper(), logging.INFO))
@@ -61,7 +130,7 @@ def setup_logger(
             os.makedirs(log_dir, exist_ok=True)
         
         if enable_rotation:
-            file_handler = RotatingFileHandler(
+            file_handler = BufferedRotatingFileHandler(
                 log_file,
                 maxBytes=max_bytes,
                 backupCount=backup_count,
@@ -73,7 +142,6 @@ def setup_logger(
         file_handler.setFormatter(formatter)
         logger.addHandler(file_handler)
     
-    _logger = logger
     return logger
 
 
@@ -12,6 +12,7 @@ arXiv个性化论文通知系统 - 主程序
 
 import os
 import sys
+import asyncio
 import argparse
 from datetime import datetime
 
@@ -24,8 +25,16 @@ from config_loader import get_config
 from logger_setup import setup_logger, get_logger
 from crawl import CrawlConfig, ArxivCrawler
 from matcher import find_relevant_papers
-from summarizer import summarize_relevant_papers
-from email_sender import send_paper_digest
+
+# summarizer（openai/httpx）和 email_sender 在对应步骤中才导入，
+# 跳过总结或发送的运行不承担这部分启动开销
+
+
+def _print_banner(title: str):
+    """输出步骤标题横幅（拼接为一次写入并立即刷新，减少输出到管道/日志时的写调用）"""
+    line = "=" * 60
+    sys.stdout.write(f"\n{line}\n{title}\n{line}\n")
+    sys.stdout.flush()
 
 
 class ArxivNotifier:
@@ -56,13 +65,11 @@ class ArxivNotifier:
     
     def _get_last_email_date(self) -> str:
         """获取上次发送邮件的日期"""
-        if os.path.exists(self.last_email_file):
-            try:
-                with open(self.last_email_file, 'r') as f:
-                    return f.read().strip()
-            except Exception:
-                return ""
-        return ""
+        try:
+            with open(self.last_email_file, 'r') as f:
+                return f.read().strip()
+        except (OSError, UnicodeDecodeError):
+            return ""
     
     def _save_email_date(self):
         """保存当前邮件发送日期"""
@@ -89,9 +96,7 @@ class ArxivNotifier:
         Args:
             force: 是否强制爬取（忽略日期检查）
         """
-        print("\n" + "=" * 60)
-        print("📥 步骤 1/4: 爬取arXiv论文")
-        print("=" * 60)
+        _print_banner("📥 步骤 1/4: 爬取arXiv论文")
         
         try:
             crawl_config = CrawlConfig(date=self.date)
@@ -111,9 +116,7 @@ class ArxivNotifier:
     
     def step2_match(self):
         """步骤2: 关键词匹配"""
-        print("\n" + "=" * 60)
-        print("🔍 步骤 2/4: 关键词匹配")
-        print("=" * 60)
+        _print_banner("🔍 步骤 2/4: 关键词匹配")
         
         keywords = self.config.keywords
         if not keywords:
@@ -138,21 +141,21 @@ class ArxivNotifier:
         )
         
         if relevant_papers:
-            print(f"\n✅ 找到 {len(relevant_papers)} 篇相关论文:")
+            # 结果列表拼接后一次输出
+            lines = [f"\n✅ 找到 {len(relevant_papers)} 篇相关论文:"]
             for i, (paper, details) in enumerate(relevant_papers, 1):
-                print(f"   {i}. [{paper.relevance_score:.2f}] {paper.title[:60]}...")
-                print(f"      匹配: {', '.join(details.get('all_matched', []))}")
+                lines.append(f"   {i}. [{paper.relevance_score:.2f}] {paper.title[:60]}...")
+                lines.append(f"      匹配: {', '.join(details.get('all_matched', []))}")
+            print('\n'.join(lines), flush=True)
         else:
             print("⚠️ 未找到相关论文")
         
         self.logger.info(f"关键词匹配完成，找到 {len(relevant_papers)} 篇相关论文")
         return relevant_papers
     
-    def step3_summarize(self, papers) -> str:
-        """步骤3: LLM总结"""
-        print("\n" + "=" * 60)
-        print("🤖 步骤 3/4: AI总结论文")
-        print("=" * 60)
+    async def step3_summarize(self, papers) -> str:
+        """步骤3: LLM总结（各批次论文并发调用LLM）"""
+        _print_banner("🤖 步骤 3/4: AI总结论文")
         
         if not papers:
             print("⚠️ 没有论文需要总结")
@@ -164,17 +167,21 @@ class ArxivNotifier:
             # 生成简单报告
             return self._generate_simple_report(papers)
         
-        print(f"📦 批量处理大小: 每次 {self.config.llm_batch_size} 篇")
+        print(f"📦 批量处理大小: 每次最多 {self.config.llm_batch_size} 篇")
         
         try:
-            digest = summarize_relevant_papers(
+            from summarizer import summarize_relevant_papers_async, CACHE_FILE_NAME
+            
+            digest = await summarize_relevant_papers_async(
                 papers=papers,
                 keywords=self.config.keywords,
                 date=self.date,
                 model=self.config.llm_model,
                 api_key=self.config.llm_api_key,
                 base_url=self.config.llm_base_url,
-                batch_size=self.config.llm_batch_size
+                batch_size=self.config.llm_batch_size,
+                cache_path=os.path.join(self.config.base_data_dir, CACHE_FILE_NAME),
+                use_batch_api=self.config.llm_use_batch_api
             )
             
             print("\n✅ 论文总结生成完成")
@@ -188,7 +195,7 @@ class ArxivNotifier:
     
     def _generate_simple_report(self, papers) -> str:
         """生成简单报告（无LLM时使用）"""
-        report = f"""# 📚 arXiv论文日报 - {self.date}
+        header = f"""# 📚 arXiv论文日报 - {self.date}
 
 关注关键词: **{', '.join(self.config.keywords)}**
 
@@ -197,10 +204,12 @@ class ArxivNotifier:
 ---
 
 """
+        # 各篇论文的段落收集后一次拼接
+        sections = [header]
         for i, (paper, details) in enumerate(papers, 1):
             matched_kw = ', '.join(details.get('all_matched', []))
             
-            report += f"""## {i}. {paper.title}
+            sections.append(f"""## {i}. {paper.title}
 
 **作者**: {', '.join(paper.authors[:5])}{'...' if len(paper.authors) > 5 else ''}
 
@@ -214,14 +223,12 @@ class ArxivNotifier:
 
 ---
 
-"""
-        return report
+""")
+        return "".join(sections)
     
     def step4_send_email(self, digest: str) -> bool:
         """步骤4: 发送邮件"""
-        print("\n" + "=" * 60)
-        print("📧 步骤 4/4: 发送邮件")
-        print("=" * 60)
+        _print_banner("📧 步骤 4/4: 发送邮件")
         
         if not digest:
             print("⚠️ 没有内容需要发送")
@@ -243,6 +250,8 @@ class ArxivNotifier:
             return False
         
         try:
+            from email_sender import send_paper_digest
+            
             success = send_paper_digest(
                 smtp_server=self.config.email_smtp_server,
                 smtp_port=self.config.email_smtp_port,
@@ -290,9 +299,7 @@ class ArxivNotifier:
             force_crawl: 是否强制爬取（忽略日期检查）
             force_send: 是否强制发送（忽略已发送检查）
         """
-        print("\n" + "=" * 60)
-        print("🚀 arXiv个性化论文通知系统")
-        print("=" * 60)
+        _print_banner("🚀 arXiv个性化论文通知系统")
         print(f"📅 日期: {self.date}")
         
         # 检查今天是否已发送过邮件
@@ -329,14 +336,12 @@ class ArxivNotifier:
             return True
         
         # 步骤3: 总结
-        digest = self.step3_summarize(relevant_papers)
+        digest = asyncio.run(self.step3_summarize(relevant_papers))
         
         # 步骤4: 发送邮件
         self.step4_send_email(digest)
         
-        print("\n" + "=" * 60)
-        print("✅ 流程完成!")
-        print("=" * 60)
+        _print_banner("✅ 流程完成!")
         
         return True
 
@@ -1,17 +1,118 @@
 """
 关键词匹配模块 - 使用BM25算法进行论文匹配
 """
+import os
 import json
 import re
 import math
+import hashlib
+import mmap
+import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from itertools import repeat
 from pathlib import Path
-from typing import List, Dict, Tuple, Union
+from typing import List, Dict, Tuple, Union, Iterator, Optional
 from dataclasses import dataclass
+from functools import lru_cache
 
+import numpy as np
 
-@dataclass
+# JSON解析：优先使用 orjson（直接解析UTF-8 bytes），未安装时回退到标准库
+# （orjson.JSONDecodeError 是 json.JSONDecodeError 的子类，异常处理无需区分）
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    _json_loads = json.loads
+
+# 多关键词单次扫描：优先使用 Aho-Corasick 自动机（pyahocorasick），未安装时逐个关键词正则匹配
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+# 词频矩阵的元素类型：单篇论文中关键词出现次数很少超过255
+TF_DTYPE = np.uint8
+TF_MAX = np.iinfo(TF_DTYPE).max
+
+# 并发读取分类JSONL文件的最大线程数
+MAX_LOAD_WORKERS = 8
+
+# 论文数达到该值时使用多进程扫描关键词（进程启动和数据传输有固定开销，小语料单进程更快）
+PARALLEL_SCAN_MIN_PAPERS = 20000
+
+# 词频扫描缓存最多保留的文件数（每天的论文集合不同，写入新缓存时删除最久未使用的文件）
+SCAN_CACHE_MAX_FILES = 8
+
+
+def _to_tf_matrix(rows: List[List[int]], shape: Tuple[int, int]) -> np.ndarray:
+    """将逐篇统计的词频转为 uint8 矩阵（超出上限的计数截断为上限）"""
+    counts = np.array(rows, dtype=np.int64).reshape(shape)
+    return np.minimum(counts, TF_MAX).astype(TF_DTYPE)
+
+
+def _is_word_char(ch: str) -> bool:
+    """与正则 \\w 一致的单词字符判断"""
+    return ch.isalnum() or ch == '_'
+
+
+def _is_boundary(text: str, pos: int) -> bool:
+    """判断 pos 处是否为词边界（与正则 \\b 语义一致）"""
+    before = pos > 0 and _is_word_char(text[pos - 1])
+    after = pos < len(text) and _is_word_char(text[pos])
+    return before != after
+
+
+@lru_cache(maxsize=16)
+def _build_automaton(keyword_list: Tuple[str, ...]):
+    """构建关键词 Aho-Corasick 自动机，值为 (关键词序号, 关键词长度)（只读共享，按关键词缓存）"""
+    automaton = ahocorasick.Automaton()
+    for idx, kw in enumerate(keyword_list):
+        if kw:
+            automaton.add_word(kw, (idx, len(kw)))
+    if len(automaton) == 0:
+        return None
+    automaton.make_automaton()
+    return automaton
+
+
+@lru_cache(maxsize=16)
+def _build_combined_patterns(keyword_list: Tuple[str, ...]) -> List[Tuple[re.Pattern, List[int]]]:
+    """
+    将关键词合并为交替正则 (?=\\b(?:(kw1)|(kw2)|...)\\b)，返回 [(正则, 分组序号→关键词序号), ...]
+    
+    零宽前瞻让每个位置都被尝试，不同关键词的匹配可以相互重叠。同一位置只能命中
+    交替中的一个分支，因此互为前缀的关键词（如 "graph" 与 "graph neural network"）
+    被分到不同的正则中；通常只需要一个正则。结果只读共享，按关键词缓存。
+    """
+    groups = []  # [[关键词序号, ...], ...]
+    for idx in sorted(range(len(keyword_list)), key=lambda i: -len(keyword_list[i])):
+        kw = keyword_list[idx]
+        if not kw:
+            continue  # 空关键词只有零宽匹配，仍使用单独的正则统计
+        for group in groups:
+            if not any(keyword_list[j].startswith(kw) for j in group):
+                group.append(idx)
+                break
+        else:
+            groups.append([idx])
+    
+    return [
+        (
+            re.compile(
+                r'(?=\b(?:' + '|'.join('(' + re.escape(keyword_list[j]) + ')' for j in group) + r')\b)',
+                re.IGNORECASE
+            ),
+            group
+        )
+        for group in groups
+    ]
+
+
+@dataclass(slots=True)
 class Paper:
-    """论文数据类"""
+    """论文数据类（使用 __slots__，不为每个实例分配 __dict__）"""
     id: str
     title: str
     summary: str
@@ -33,7 +134,7 @@ class BM25Matcher:
     # 位置权重
     TITLE_WEIGHT = 3.0  # 标题匹配的额外权重
     
-    def __init__(self, keywords: Union[List[str], Dict[str, float]]):
+    def __init__(self, keywords: Union[List[str], Dict[str, float]], cache_dir: Optional[str] = None):
         """
         初始化匹配器
         
@@ -41,54 +142,227 @@ class BM25Matcher:
             keywords: 关键词列表或关键词权重字典
                 - 列表形式: ["LLM", "transformer"]，权重默认为1.0
                 - 字典形式: {"LLM": 2.0, "transformer": 1.5}，指定每个关键词的权重
+            cache_dir: 词频扫描结果的缓存目录（None表示不缓存）
         """
+        self.cache_dir = cache_dir
+        
         # 解析关键词和权重
         if isinstance(keywords, dict):
             self.keywords = {kw.lower(): weight for kw, weight in keywords.items()}
         else:
             self.keywords = {kw.lower(): 1.0 for kw in keywords}
         
+        # 关键词顺序固定，对应词频矩阵的列
+        self._keyword_list = list(self.keywords.keys())
+        self._weights = np.array([self.keywords[kw] for kw in self._keyword_list], dtype=np.float32)
+        
         # 预编译关键词正则表达式（词边界匹配）
         self.keyword_patterns = {
             kw: re.compile(r'\b' + re.escape(kw) + r'\b', re.IGNORECASE)
             for kw in self.keywords.keys()
         }
         
+        # 所有关键词构建为一个自动机，每段文本只需扫描一次；
+        # 未安装 pyahocorasick 时改用合并的交替正则
+        # 编译结果按关键词元组在进程内缓存，重复构建匹配器（如多进程扫描的各分片）时直接复用
+        keyword_tuple = tuple(self._keyword_list)
+        self._automaton = _build_automaton(keyword_tuple) if ahocorasick is not None else None
+        self._combined_patterns = _build_combined_patterns(keyword_tuple) if self._automaton is None else []
+        
         # 文档统计（用于IDF计算）
         self.doc_count = 0
         self.keyword_doc_freq = {kw: 0 for kw in self.keywords.keys()}
         self.avg_doc_len = 0
+        self._idf = np.zeros(len(self._keyword_list), dtype=np.float32)
+    
+    def _count_all_regex(self, text: str) -> List[int]:
+        """_count_all 的正则实现（未安装 pyahocorasick 时使用）"""
+        counts = [0] * len(self._keyword_list)
+        next_start = [0] * len(self._keyword_list)
+        for pattern, group in self._combined_patterns:
+            for m in pattern.finditer(text):
+                idx = group[m.lastindex - 1]
+                start = m.start()
+                if start < next_start[idx]:
+                    continue
+                counts[idx] += 1
+                next_start[idx] = m.end(m.lastindex)
+        
+        for idx, kw in enumerate(self._keyword_list):
+            if not kw:
+                counts[idx] = len(self.keyword_patterns[kw].findall(text))
+        return counts
+    
+    def _count_all(self, text: str) -> List[int]:
+        """
+        统计所有关键词在（已小写的）文本中的匹配次数
+        
+        结果与逐个关键词执行 \\b关键词\\b 的 findall 一致：只统计词边界处的匹配，
+        同一关键词的多次匹配互不重叠。
+        """
+        if self._automaton is None:
+            return self._count_all_regex(text)
+        
+        counts = [0] * len(self._keyword_list)
+        next_start = [0] * len(self._keyword_list)  # 同一关键词下一次匹配允许的最小起始位置
+        for end, (idx, length) in self._automaton.iter(text):
+            start = end - length + 1
+            if start < next_start[idx]:
+                continue
+            # 自动机只做子串匹配，命中后再校验两端的词边界
+            if _is_boundary(text, start) and _is_boundary(text, end + 1):
+                counts[idx] += 1
+                next_start[idx] = end + 1
+        return counts
+    
+    def _scan_papers(self, papers: List[Paper]):
+        """
+        扫描论文，统计每个关键词在标题和摘要中的词频（大语料分片后多进程并行扫描）
+        
+        Returns:
+            (标题词频矩阵[N,K], 摘要词频矩阵[N,K], 标题长度[N], 摘要长度[N])
+        """
+        # 按字段连续存放（SoA）：每个字段只小写一次，扫描时不再逐个访问论文对象
+        titles = [paper.title.lower() for paper in papers]
+        summaries = [paper.summary.lower() for paper in papers]
+        workers = os.cpu_count() or 1
+        if len(papers) < PARALLEL_SCAN_MIN_PAPERS or workers < 2:
+            return self._scan_fields(titles, summaries)
+        
+        chunk_size = math.ceil(len(papers) / workers)
+        bounds = range(0, len(papers), chunk_size)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(
+                    _scan_chunk,
+                    repeat(self.keywords),
+                    (titles[i:i + chunk_size] for i in bounds),
+                    (summaries[i:i + chunk_size] for i in bounds),
+                ))
+        except (OSError, BrokenProcessPool) as e:
+            print(f"多进程扫描失败，改为单进程: {e}")
+            return self._scan_fields(titles, summaries)
+        
+        # 按分片顺序拼接，行顺序与论文顺序一致
+        return tuple(np.concatenate(parts) for parts in zip(*results))
     
-    def _tokenize(self, text: str) -> List[str]:
-        """简单分词"""
-        return text.lower().split()
+    def _scan_fields(self, titles: List[str], summaries: List[str]):
+        """逐篇扫描已小写的标题和摘要，返回值同 _scan_papers"""
+        title_rows = []
+        abstract_rows = []
+        title_lens = []
+        abstract_lens = []
+        
+        # 同一字符串同时用于计算长度和关键词匹配
+        for title, summary in zip(titles, summaries):
+            # 文档长度按空白分词计数（不能用 count(' ')，连续空白和换行会计数错误）
+            title_lens.append(len(title.split()))
+            abstract_lens.append(len(summary.split()))
+            title_rows.append(self._count_all(title))
+            abstract_rows.append(self._count_all(summary))
+        
+        # 词频以 uint8 存储（超过255次按255计，BM25词频饱和后得分差异可忽略），长度和得分使用 float32
+        shape = (len(titles), len(self._keyword_list))
+        return (
+            _to_tf_matrix(title_rows, shape),
+            _to_tf_matrix(abstract_rows, shape),
+            np.array(title_lens, dtype=np.float32),
+            np.array(abstract_lens, dtype=np.float32),
+        )
+    
+    def _scan_cache_path(self, papers: List[Paper]) -> str:
+        """
+        词频扫描结果的缓存文件路径
+        
+        缓存键由论文（按顺序的ID、标题、摘要）和关键词列表决定，二者任一变化即失效；
+        关键词权重、阈值等只影响打分，修改后仍可复用缓存。
+        """
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps(self._keyword_list, ensure_ascii=False).encode('utf-8'))
+        for paper in papers:
+            digest.update(f"\0{paper.id}\0{paper.title}\0{paper.summary}".encode('utf-8'))
+        return os.path.join(self.cache_dir, f"{digest.hexdigest()}.npz")
+    
+    def _load_scan_cache(self, cache_path: str, doc_count: int):
+        """读取缓存的词频扫描结果，文件不存在、损坏或形状不符时返回 None"""
+        try:
+            with np.load(cache_path) as data:
+                scan = (data['tf_title'], data['tf_abstract'], data['title_len'], data['abstract_len'])
+        except (OSError, ValueError, KeyError, zipfile.BadZipFile):
+            return None
+        shape = (doc_count, len(self._keyword_list))
+        if scan[0].shape != shape or scan[1].shape != shape or scan[0].dtype != TF_DTYPE:
+            return None
+        # 更新修改时间，清理时按最近使用保留
+        try:
+            os.utime(cache_path)
+        except OSError:
+            pass
+        return scan
     
-    def _count_keyword_matches(self, text: str, keyword: str) -> int:
-        """统计关键词在文本中的匹配次数"""
-        pattern = self.keyword_patterns.get(keyword)
-        if pattern:
-            return len(pattern.findall(text))
-        return 0
+    def _save_scan_cache(self, cache_path: str, scan):
+        """原子写入词频扫描结果，写入失败时静默跳过"""
+        tmp_path = f"{cache_path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp_path, 'wb') as f:
+                np.savez(
+                    f, tf_title=scan[0], tf_abstract=scan[1],
+                    title_len=scan[2], abstract_len=scan[3]
+                )
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        self._prune_scan_cache()
+    
+    def _prune_scan_cache(self):
+        """只保留最近使用的 SCAN_CACHE_MAX_FILES 个缓存文件，避免缓存目录随每日运行无限增长"""
+        try:
+            with os.scandir(self.cache_dir) as entries:
+                files = [
+                    (entry.stat().st_mtime_ns, entry.path) for entry in entries
+                    if entry.name.endswith('.npz') and entry.is_file()
+                ]
+        except OSError:
+            return
+        files.sort(reverse=True)
+        for _, path in files[SCAN_CACHE_MAX_FILES:]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
     
     def _build_corpus_stats(self, papers: List[Paper]):
-        """构建语料库统计信息（用于IDF计算）"""
+        """构建语料库统计信息（词频矩阵、文档长度和用于IDF计算的文档频率）"""
         self.doc_count = len(papers)
-        total_len = 0
         
-        # 重置文档频率
-        self.keyword_doc_freq = {kw: 0 for kw in self.keywords.keys()}
+        # 论文和关键词不变时（如只调整阈值或权重后重跑）直接复用上次的扫描结果
+        scan = None
+        if self.cache_dir:
+            cache_path = self._scan_cache_path(papers)
+            scan = self._load_scan_cache(cache_path, self.doc_count)
+        if scan is None:
+            scan = self._scan_papers(papers)
+            if self.cache_dir:
+                self._save_scan_cache(cache_path, scan)
+        self._tf_title, self._tf_abstract, self._title_len, self._abstract_len = scan
         
-        for paper in papers:
-            # 合并标题和摘要
-            text = f"{paper.title} {paper.summary}".lower()
-            total_len += len(self._tokenize(text))
-            
-            # 统计包含每个关键词的文档数
-            for keyword in self.keywords.keys():
-                if self._count_keyword_matches(text, keyword) > 0:
-                    self.keyword_doc_freq[keyword] += 1
+        # 文档长度为标题和摘要的总词数
+        total_len = self._title_len.sum(dtype=np.float64) + self._abstract_len.sum(dtype=np.float64)
+        self.avg_doc_len = float(total_len) / max(self.doc_count, 1)
+        
+        # 统计包含每个关键词的文档数（标题或摘要中出现即计入）
+        doc_freq = ((self._tf_title > 0) | (self._tf_abstract > 0)).sum(axis=0)
+        self.keyword_doc_freq = dict(zip(self._keyword_list, doc_freq.tolist()))
         
-        self.avg_doc_len = total_len / max(self.doc_count, 1)
+        # BM25 IDF公式（确保非负）
+        self._idf = np.maximum(
+            np.log((self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5) + 1), 0
+        ).astype(np.float32)
     
     def _calculate_idf(self, keyword: str) -> float:
         """计算关键词的IDF值"""
@@ -97,83 +371,83 @@ class BM25Matcher:
         idf = math.log((self.doc_count - doc_freq + 0.5) / (doc_freq + 0.5) + 1)
         return max(idf, 0)  # 确保非负
     
-    def _calculate_bm25_score(self, text: str, doc_len: int) -> Tuple[float, List[str]]:
+    def _score_matrix(self, tf: np.ndarray, doc_len: np.ndarray) -> np.ndarray:
         """
-        计算文本的BM25得分
+        批量计算BM25得分
+        
+        Args:
+            tf: 词频矩阵 [N, K]
+            doc_len: 文档长度 [N]
         
         Returns:
-            (得分, 匹配到的关键词列表)
+            每篇文档的得分 [N]
         """
-        score = 0.0
-        matched_keywords = []
-        
-        for keyword, weight in self.keywords.items():
-            # 计算词频
-            tf = self._count_keyword_matches(text, keyword)
-            
-            if tf > 0:
-                matched_keywords.append(keyword)
-                
-                # IDF
-                idf = self._calculate_idf(keyword)
-                
-                # BM25 TF归一化
-                tf_normalized = (tf * (self.K1 + 1)) / (
-                    tf + self.K1 * (1 - self.B + self.B * doc_len / max(self.avg_doc_len, 1))
-                )
-                
-                # 最终得分 = IDF * TF_normalized * 关键词权重
-                score += idf * tf_normalized * weight
+        avg_doc_len = np.float32(max(self.avg_doc_len, 1))
+        # 只在计算时将 uint8 词频转为 float32
+        tf = tf.astype(np.float32)
+        # BM25 TF归一化（词频为0的项结果为0，不贡献得分）
+        length_norm = 1 - self.B + self.B * doc_len[:, None] / avg_doc_len
+        tf_normalized = (tf * (self.K1 + 1)) / (tf + self.K1 * length_norm)
         
-        return score, matched_keywords
+        # 最终得分 = Σ IDF * TF_normalized * 关键词权重
+        return (tf_normalized * self._idf) @ self._weights
     
-    def score_paper(self, paper: Paper) -> Tuple[float, Dict]:
+    def _combine_scores(self, tf_title, tf_abstract, title_len, abstract_len):
         """
-        计算单篇论文的相关性得分
-        
-        Args:
-            paper: 论文对象
+        计算标题得分、摘要得分和总得分
         
         Returns:
-            (得分, 匹配详情)
+            (总得分[N], 标题得分[N], 摘要得分[N])
         """
-        title_tokens = self._tokenize(paper.title)
-        abstract_tokens = self._tokenize(paper.summary)
-        
         # 标题得分（带权重加成）
-        title_score, title_keywords = self._calculate_bm25_score(
-            paper.title.lower(), len(title_tokens)
-        )
-        title_score *= self.TITLE_WEIGHT
+        title_scores = self._score_matrix(tf_title, title_len) * self.TITLE_WEIGHT
         
         # 摘要得分
-        abstract_score, abstract_keywords = self._calculate_bm25_score(
-            paper.summary.lower(), len(abstract_tokens)
-        )
+        abstract_scores = self._score_matrix(tf_abstract, abstract_len)
         
-        # 合并匹配到的关键词
-        all_matched = list(set(title_keywords + abstract_keywords))
+        # 如果同时在标题和摘要中匹配，按重叠关键词的权重总和额外加分
+        overlap_weight = ((tf_title > 0) & (tf_abstract > 0)) @ self._weights
+        total_scores = (title_scores + abstract_scores) * (1.0 + 0.1 * overlap_weight)
         
-        # 总得分
-        total_score = title_score + abstract_score
+        return total_scores, title_scores, abstract_scores
+    
+    def _match_details(self, tf_title_row, tf_abstract_row, title_score: float, abstract_score: float) -> Dict:
+        """根据单篇论文的词频生成匹配详情"""
+        # 命中掩码：合并结果直接由掩码做或运算得到，不再构造临时集合或字典
+        title_hit = tf_title_row > 0
+        abstract_hit = tf_abstract_row > 0
+        keyword_list = self._keyword_list
+        title_keywords = [keyword_list[j] for j in np.flatnonzero(title_hit)]
+        abstract_keywords = [keyword_list[j] for j in np.flatnonzero(abstract_hit)]
         
-        # 如果同时在标题和摘要中匹配，额外加分
-        overlap = set(title_keywords) & set(abstract_keywords)
-        if overlap:
-            # 计算重叠关键词的权重总和
-            overlap_weight = sum(self.keywords.get(kw, 1.0) for kw in overlap)
-            total_score *= (1.0 + 0.1 * overlap_weight)
+        # 合并匹配到的关键词（按关键词配置顺序）
+        all_matched = [keyword_list[j] for j in np.flatnonzero(title_hit | abstract_hit)]
         
-        match_details = {
+        return {
             'title_keywords': title_keywords,
             'abstract_keywords': abstract_keywords,
             'all_matched': all_matched,
-            'title_score': title_score,
-            'abstract_score': abstract_score,
+            'title_score': float(title_score),
+            'abstract_score': float(abstract_score),
             'keyword_weights': {kw: self.keywords.get(kw, 1.0) for kw in all_matched}
         }
+    
+    def score_paper(self, paper: Paper) -> Tuple[float, Dict]:
+        """
+        计算单篇论文的相关性得分（使用当前的语料库统计信息）
+        
+        Args:
+            paper: 论文对象
         
-        return total_score, match_details
+        Returns:
+            (得分, 匹配详情)
+        """
+        tf_title, tf_abstract, title_len, abstract_len = self._scan_papers([paper])
+        total_scores, title_scores, abstract_scores = self._combine_scores(
+            tf_title, tf_abstract, title_len, abstract_len
+        )
+        details = self._match_details(tf_title[0], tf_abstract[0], title_scores[0], abstract_scores[0])
+        return float(total_scores[0]), details
     
     def match_papers(
         self, 
@@ -195,64 +469,91 @@ class BM25Matcher:
         # 构建语料库统计信息
         self._build_corpus_stats(papers)
         
-        scored_papers = []
+        # 一次性计算所有论文的得分
+        total_scores, title_scores, abstract_scores = self._combine_scores(
+            self._tf_title, self._tf_abstract, self._title_len, self._abstract_len
+        )
         
-        for paper in papers:
-            score, details = self.score_paper(paper)
-            if score >= threshold:
-                paper.relevance_score = score
-                scored_papers.append((paper, details))
+        # 先只按得分筛选和排序论文下标，匹配详情只为最终返回的论文构建
+        selected = np.flatnonzero(total_scores >= threshold)
         
-        # 按得分降序排序
-        scored_papers.sort(key=lambda x: x[0].relevance_score, reverse=True)
+        # 限制返回数量：只需前 top_k 篇时用部分选择代替全量排序
+        if top_k is not None and 0 < top_k < len(selected):
+            selected = _select_top_k(total_scores, selected, top_k)
         
-        # 限制返回数量
-        if top_k is not None and top_k > 0:
-            scored_papers = scored_papers[:top_k]
+        # 按得分降序排序（稳定排序，同分论文保持原有顺序）
+        selected = selected[np.argsort(-total_scores[selected], kind='stable')].tolist()
+        
+        scored_papers = []
+        for i in selected:
+            paper = papers[i]
+            paper.relevance_score = float(total_scores[i])
+            details = self._match_details(
+                self._tf_title[i], self._tf_abstract[i], title_scores[i], abstract_scores[i]
+            )
+            scored_papers.append((paper, details))
         
         return scored_papers
 
 
+def _select_top_k(scores: np.ndarray, candidates: np.ndarray, top_k: int) -> np.ndarray:
+    """
+    从候选下标（升序）中选出得分最高的 top_k 个（O(N) 部分选择，结果未排序）
+    
+    与先全量稳定排序再截断的结果一致：第 top_k 名存在同分时，保留下标靠前的论文。
+    """
+    candidate_scores = scores[candidates]
+    kth_score = np.partition(candidate_scores, len(candidates) - top_k)[len(candidates) - top_k]
+    
+    above = candidates[candidate_scores > kth_score]
+    ties = candidates[candidate_scores == kth_score][:top_k - len(above)]
+    return np.concatenate((above, ties))
+
+
+def _scan_chunk(keywords: Dict[str, float], titles: List[str], summaries: List[str]):
+    """子进程入口：扫描一个分片的论文（子进程中重新构建匹配器）"""
+    return BM25Matcher(keywords)._scan_fields(titles, summaries)
+
+
 # 保持向后兼容
 KeywordMatcher = BM25Matcher
 
 
-def load_papers_from_jsonl(jsonl_path: str) -> List[Paper]:
+def load_papers_from_jsonl(jsonl_path: str) -> Iterator[Paper]:
     """
-    从JSONL文件加载论文数据
+    从JSONL文件逐行加载论文数据（生成器，不在内存中累积整个文件）
     
     Args:
         jsonl_path: JSONL文件路径
     
-    Returns:
-        论文列表
+    Yields:
+        论文对象
     """
-    papers = []
-    
-    with open(jsonl_path, 'r', encoding='utf-8') as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            
-            try:
-                data = json.loads(line)
-                paper = Paper(
-                    id=data.get('id', ''),
-                    title=data.get('title', ''),
-                    summary=data.get('summary', ''),
-                    authors=data.get('authors', []),
-                    categories=data.get('categories', []),
-                    pdf_url=data.get('pdf', ''),
-                    abs_url=data.get('abs', ''),
-                    comment=data.get('comment', '')
-                )
-                papers.append(paper)
-            except json.JSONDecodeError as e:
-                print(f"解析JSON行失败: {e}")
-                continue
-    
-    return papers
+    with open(jsonl_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return  # 空文件无法 mmap
+        
+        # mmap 后按行切片，行尾换行符由JSON解析器作为空白忽略
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            for line in iter(mm.readline, b''):
+                if line.isspace():
+                    continue
+                
+                try:
+                    data = _json_loads(line)
+                    yield Paper(
+                        id=data.get('id', ''),
+                        title=data.get('title', ''),
+                        summary=data.get('summary', ''),
+                        authors=data.get('authors', []),
+                        categories=data.get('categories', []),
+                        pdf_url=data.get('pdf', ''),
+                        abs_url=data.get('abs', ''),
+                        comment=data.get('comment', '')
+                    )
+                except json.JSONDecodeError as e:
+                    print(f"解析JSON行失败: {e}")
+                    continue
 
 
 def load_papers_from_directory(data_dir: str) -> List[Paper]:
@@ -265,29 +566,35 @@ def load_papers_from_directory(data_dir: str) -> List[Paper]:
     Returns:
         论文列表
     """
-    papers = []
+    unique_papers = []
     jsonl_dir = Path(data_dir) / "jsonl"
     
     if not jsonl_dir.exists():
-        return papers
+        return unique_papers
     
-    # 遍历所有分类目录
+    # 遍历所有分类目录，直接查找 papers.jsonl 文件
+    jsonl_files = []
     for category_dir in jsonl_dir.iterdir():
         if not category_dir.is_dir():
             continue
-        
-        # 直接查找 papers.jsonl 文件
         jsonl_file = category_dir / "papers.jsonl"
         if jsonl_file.exists():
-            papers.extend(load_papers_from_jsonl(str(jsonl_file)))
+            jsonl_files.append(str(jsonl_file))
     
-    # 去重（同一篇论文可能出现在多个分类中）
-    seen_ids = set()
-    unique_papers = []
-    for paper in papers:
-        if paper.id not in seen_ids:
-            seen_ids.add(paper.id)
-            unique_papers.append(paper)
+    if not jsonl_files:
+        return unique_papers
+    
+    # 多个分类文件并发读取，结果按目录遍历顺序返回
+    with ThreadPoolExecutor(max_workers=min(MAX_LOAD_WORKERS, len(jsonl_files))) as executor:
+        loaded = executor.map(lambda path: list(load_papers_from_jsonl(path)), jsonl_files)
+        
+        # 去重（同一篇论文可能出现在多个分类中）
+        seen_ids = set()
+        for papers in loaded:
+            for paper in papers:
+                if paper.id not in seen_ids:
+                    seen_ids.add(paper.id)
+                    unique_papers.append(paper)
     
     return unique_papers
 
@@ -296,7 +603,8 @@ def find_relevant_papers(
     data_dir: str,
     keywords: Union[List[str], Dict[str, float]],
     threshold: float = 0.5,
-    top_k: int = None
+    top_k: int = None,
+    use_cache: bool = True
 ) -> List[Tuple[Paper, Dict]]:
     """
     查找与关键词相关的论文
@@ -306,6 +614,7 @@ def find_relevant_papers(
         keywords: 关键词列表或关键词权重字典
         threshold: 得分阈值
         top_k: 最大论文数量（None表示不限制）
+        use_cache: 是否在 {data_dir}/.bm25_cache 中缓存词频扫描结果
     
     Returns:
         相关论文列表
@@ -320,7 +629,8 @@ def find_relevant_papers(
     print(f"加载了 {len(papers)} 篇论文")
     
     # BM25匹配
-    matcher = BM25Matcher(keywords)
+    cache_dir = os.path.join(data_dir, ".bm25_cache") if use_cache else None
+    matcher = BM25Matcher(keywords, cache_dir=cache_dir)
     relevant_papers = matcher.match_papers(papers, threshold, top_k)
     
     # 显示结果信息
@@ -2,12 +2,258 @@
 LLM论文总结模块 - 使用大模型生成高质量论文报告
 """
 import os
-from typing import List, Dict, Tuple, Optional, Union
-from openai import OpenAI
+import re
+import json
+import time
+import asyncio
+import hashlib
+import sqlite3
+import threading
+from functools import lru_cache
+from typing import List, Dict, Tuple, Optional, Union, Callable
+from openai import OpenAI, AsyncOpenAI
+
+# 精确计算提示词token数（可选，未安装时按字符数估算）
+try:
+    import tiktoken
+except ImportError:
+    tiktoken = None
 
 from matcher import Paper
 
 
+# 并发中的LLM请求数上限（避免触发API的并发/速率限制）
+MAX_CONCURRENT_REQUESTS = 8
+
+# 相关论文少于该数量时不单独调用LLM生成概览（概览与逐篇解读基本重复）
+MIN_PAPERS_FOR_OVERVIEW = 3
+OVERVIEW_MAX_PAPERS = 10      # 概览提示词中最多列出的论文数
+OVERVIEW_MAX_TOKENS = 800     # 概览的输出token预算
+
+# 限流(429)、超时、连接错误和5xx时的最大重试次数（由SDK按指数退避加随机抖动重试）
+LLM_MAX_RETRIES = 5
+
+# 自适应批量大小：单次调用论文数越多往返越少，但超过约8篇后解读质量明显下降
+MAX_BATCH_SIZE = 8
+TARGET_PROMPT_TOKENS = 6000     # 单次调用的输入token预算
+PROMPT_OVERHEAD_TOKENS = 600    # 提示词中固定说明部分的token数
+CHARS_PER_TOKEN = 4             # 英文标题/摘要的字符数与token数的近似比例
+OUTPUT_TOKENS_PER_PAPER = 1000  # 每篇论文解读（约600-700字）的输出token预算
+MAX_OUTPUT_TOKENS = 4000        # 单次调用的输出token上限（部分服务端/模型的输出上限为4096）
+MODEL_CONTEXT_TOKENS = 32768    # 按常见模型中较小的上下文窗口（输入+输出）估计，输入过长时据此减小 max_tokens
+CONTEXT_SAFETY_TOKENS = 256     # 分词器与模型实际分词差异的余量
+TOKEN_ENCODING = "cl100k_base"
+
+
+# Batch API：当天全部批次一次提交，服务端排队处理（费用约为实时调用的一半，不保证时延）
+BATCH_API_COMPLETION_WINDOW = "24h"
+BATCH_API_POLL_SECONDS = 30
+BATCH_API_FINAL_STATUSES = ("completed", "failed", "expired", "cancelled")
+
+
+# LLM响应缓存文件名（位于数据目录下）
+CACHE_FILE_NAME = ".llm_cache.sqlite"
+# 缓存条目的保留天数（每日论文集合几天后基本不再复用，打开缓存时删除更早的条目）
+CACHE_MAX_AGE_DAYS = 14
+
+# 调用失败时 _call_llm 返回的内容前缀（失败结果不写入缓存）
+FAILURE_PREFIX = "生成失败: "
+
+
+# 批量解读结果中每篇论文的分隔符（容忍模型在分隔符内插入空白，如 "=== 论文 1 ==="）
+_SECTION_MARK = re.compile(r'===\s*论文\s*\d+\s*===')
+_PAPER_SPLIT_RE = re.compile(_SECTION_MARK.pattern + r'\s*')
+_SECTION_MARK_MAX_LEN = 32  # 增量扫描时回看的字符数，避免漏掉跨块的分隔符
+
+# 最后一个批次附带生成今日概览，位于 ===概览=== 分隔符之后
+_OVERVIEW_SPLIT_RE = re.compile(r'===\s*概览\s*===\s*')
+
+# 批量解读的系统提示词：包含全部固定说明和输出格式，所有批次逐字节相同，
+# 支持前缀缓存的服务端（如DeepSeek）对这部分输入按缓存命中计费、跳过重复的预填充
+_BATCH_SYSTEM_PROMPT = """你是一位资深的AI/ML研究员，擅长用通俗易懂的中文解读学术论文。
+你的解读应该简洁、专业、有深度。
+
+用户会给出其关注领域和若干篇arXiv论文（标题与摘要），请对每篇论文从以下两个方面进行解读：
+
+1. **研究背景与挑战**（300-350字）：这个领域的现状是什么？论文要解决什么问题？
+
+2. **方法与实验结论**（300-350字）：论文提出了什么方法？取得了什么效果？
+
+**输出格式要求**：
+- 每篇论文之间用 "===论文N===" 分隔（N为论文序号1,2,3...）
+- 每篇论文包含两个段落，段落之间空一行
+- 不需要加粗或标题，直接写内容
+
+示例输出格式：
+===论文1===
+这个领域目前面临...研究背景与挑战的描述...
+
+该论文提出了...方法与实验结论的描述...
+===论文2===
+...
+"""
+
+
+class _SectionStream:
+    """在流式响应中增量检测 ===论文N=== 分隔符，统计已完整输出的论文数"""
+    
+    def __init__(self):
+        self._chunks = []
+        self._tail = ""  # 最近一个分隔符之后的文本
+        self._markers = 0
+    
+    def feed(self, delta: str) -> int:
+        """
+        追加一段增量文本
+        
+        Returns:
+            本次新完成的论文数（出现下一个分隔符时，前一篇即已完整）
+        """
+        self._chunks.append(delta)
+        search_from = max(len(self._tail) - _SECTION_MARK_MAX_LEN, 0)
+        self._tail += delta
+        completed = 0
+        while True:
+            m = _SECTION_MARK.search(self._tail, search_from)
+            if not m:
+                return completed
+            if self._markers:
+                completed += 1
+            self._markers += 1
+            self._tail = self._tail[m.end():]
+            search_from = 0
+    
+    def text(self) -> str:
+        """完整的响应文本"""
+        return "".join(self._chunks)
+
+
+def _cache_key(*parts: str) -> str:
+    """由若干字符串计算缓存键"""
+    return hashlib.sha256('\0'.join(parts).encode('utf-8')).hexdigest()
+
+
+class LLMCache:
+    """LLM响应的SQLite缓存（键包含模型名与完整提示词，二者变化即失效）"""
+    
+    def __init__(self, path: str, max_age_days: float = CACHE_MAX_AGE_DAYS):
+        """
+        打开（必要时创建）缓存数据库，并删除超过保留期的条目
+        
+        Args:
+            path: SQLite数据库文件路径
+            max_age_days: 条目保留天数
+        """
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # 概览在线程中生成，连接需跨线程使用，由锁串行化访问
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS responses (key TEXT PRIMARY KEY, response TEXT, ts INTEGER)"
+            )
+            self._conn.execute(
+                "DELETE FROM responses WHERE ts < ?",
+                (int(time.time() - max_age_days * 86400),)
+            )
+    
+    def get(self, key: str) -> Optional[str]:
+        """读取缓存，未命中或读取失败时返回 None"""
+        try:
+            with self._lock:
+                row = self._conn.execute("SELECT response FROM responses WHERE key = ?", (key,)).fetchone()
+        except sqlite3.Error:
+            return None
+        return row[0] if row else None
+    
+    def set(self, key: str, response: str):
+        """写入缓存，写入失败时静默跳过"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, response, ts) VALUES (?, ?, ?)",
+                    (key, response, int(time.time()))
+                )
+        except sqlite3.Error:
+            pass
+    
+    def close(self):
+        """关闭数据库连接"""
+        with self._lock:
+            self._conn.close()
+
+
+def _normalize_keywords(keywords: Union[List[str], Tuple[str, ...], Dict[str, float]]) -> Tuple[Tuple[str, ...], str]:
+    """
+    统一关键词格式
+    
+    Returns:
+        (关键词元组, 展示字符串)；带权重字典展示为 "关键词(权重)"。
+        传入的已是元组时视为已处理过的关键词列表。
+    """
+    if isinstance(keywords, dict):
+        return tuple(keywords), ', '.join(f"{k}({v})" for k, v in keywords.items())
+    kw_list = tuple(keywords)
+    return kw_list, ', '.join(kw_list)
+
+
+@lru_cache(maxsize=1)
+def _get_token_encoding():
+    """加载tiktoken分词器（只加载一次）；未安装或加载失败时返回None"""
+    if tiktoken is None:
+        return None
+    try:
+        return tiktoken.get_encoding(TOKEN_ENCODING)
+    except Exception as e:
+        # 首次使用需要下载词表，离线时回退到估算
+        print(f"⚠️ 无法加载tiktoken分词器，按字符数估算token: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    """
+    计算文本的token数
+    
+    安装 tiktoken 时精确计数；否则按 UTF-8字节数/3 估算
+    （中文约3字节/token，英文实际约4字节/token，估算值偏大）
+    """
+    encoding = _get_token_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(text.encode('utf-8')) // 3 + 1
+
+
+def _escape_table_cell(text: str) -> str:
+    """转义Markdown表格单元格中的竖线"""
+    return text.replace('|', '\\|')
+
+
+def auto_batch_size(
+    papers: List[Paper],
+    max_batch_size: int = MAX_BATCH_SIZE,
+    target_prompt_tokens: int = TARGET_PROMPT_TOKENS
+) -> int:
+    """
+    根据论文平均长度选择批量大小：在输入token预算内尽量多放论文
+    
+    Args:
+        papers: 待解读的论文
+        max_batch_size: 批量大小上限（不超过 MAX_BATCH_SIZE）
+        target_prompt_tokens: 单次调用的输入token预算
+    
+    Returns:
+        每次LLM调用处理的论文数量（至少为1）
+    """
+    if not papers:
+        return 1
+    avg_chars = sum(len(p.title) + len(p.summary) for p in papers) / len(papers)
+    avg_tokens = max(avg_chars / CHARS_PER_TOKEN, 1)
+    fit = int((target_prompt_tokens - PROMPT_OVERHEAD_TOKENS) // avg_tokens)
+    return max(1, min(fit, max_batch_size, MAX_BATCH_SIZE))
+
+
 class PaperSummarizer:
     """论文总结器 - 生成高质量的论文解读报告"""
     
@@ -15,7 +261,10 @@ class PaperSummarizer:
         self,
         model: str = "deepseek-chat",
         api_key: str = "",
-        base_url: str = "https://api.deepseek.com"
+        base_url: str = "https://api.deepseek.com",
+        cache_path: Optional[str] = None,
+        verbose: bool = True,
+        use_batch_api: bool = False
     ):
         """
         初始化总结器
@@ -24,8 +273,14 @@ class PaperSummarizer:
             model: 模型名称
             api_key: API密钥
             base_url: API基础URL
+            cache_path: LLM响应缓存（SQLite）路径，None表示不缓存
+            verbose: 是否打印逐批次/逐篇的解读进度（警告信息始终打印）
+            use_batch_api: 是否通过 Batch API 提交解读请求（适合对时延不敏感的定时任务，
+                服务端不支持时自动回退到实时调用）
         """
         self.model = model
+        self.verbose = verbose
+        self.use_batch_api = use_batch_api
         self.api_key = api_key or os.environ.get('LLM_API_KEY', '')
         self.base_url = base_url
         
@@ -34,11 +289,107 @@ class PaperSummarizer:
         
         self.client = OpenAI(
             api_key=self.api_key,
-            base_url=self.base_url
+            base_url=self.base_url,
+            max_retries=LLM_MAX_RETRIES
         )
+        # 同步和异步客户端各自持有一个HTTP连接池（SDK默认最多1000个连接、100个长连接），
+        # 所有请求复用其中的长连接，不会为每次调用重新建立TCP/TLS连接。
+        # 异步客户端：多个批次的解读请求并发发送（首次使用时创建，连接池绑定所在的事件循环）
+        self._async_client = None
+        
+        # 最近一次 summarize_papers 随最后一个批次生成的今日概览（未生成时为None）
+        self.last_overview: Optional[str] = None
+        
+        # 相同提示词（如重跑同一天、日期间重叠的论文）直接复用之前的结果
+        self.cache = None
+        if cache_path:
+            try:
+                self.cache = LLMCache(cache_path)
+            except (OSError, sqlite3.Error) as e:
+                print(f"⚠️ 无法打开LLM缓存，将不使用缓存: {e}")
+    
+    @property
+    def async_client(self) -> AsyncOpenAI:
+        """异步LLM客户端"""
+        if self._async_client is None:
+            self._async_client = AsyncOpenAI(
+                api_key=self.api_key,
+                base_url=self.base_url,
+                max_retries=LLM_MAX_RETRIES
+            )
+        return self._async_client
+    
+    async def aclose(self):
+        """关闭异步客户端的连接池（之后再使用会重新创建）"""
+        if self._async_client is not None:
+            client, self._async_client = self._async_client, None
+            await client.close()
+    
+    def plan_batch_size(self, papers: List[Paper], max_batch_size: int) -> int:
+        """
+        规划本次解读的批量大小
+        
+        按输入token预算选择（不超过配置的批量大小），见 auto_batch_size。
+        """
+        return auto_batch_size(papers, max_batch_size)
+    
+    def close(self):
+        """关闭同步客户端的连接池和缓存数据库（异步客户端见 aclose）"""
+        self.client.close()
+        if self.cache is not None:
+            self.cache.close()
+            self.cache = None
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+        return False
+    
+    def _response_cache_key(self, system_prompt: str, user_prompt: str) -> str:
+        """整次调用的缓存键"""
+        return _cache_key("response", self.model, system_prompt, user_prompt)
     
     def _call_llm(self, system_prompt: str, user_prompt: str, max_tokens: int = 2000) -> str:
-        """调用LLM"""
+        """调用LLM（启用缓存时先查缓存）"""
+        if self.cache is not None:
+            key = self._response_cache_key(system_prompt, user_prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = self._request_llm(system_prompt, user_prompt, max_tokens)
+        if self.cache is not None and not result.startswith(FAILURE_PREFIX):
+            self.cache.set(key, result)
+        return result
+    
+    async def _call_llm_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int = 2000,
+        on_section: Optional[Callable[[int], None]] = None
+    ) -> str:
+        """
+        异步调用LLM（启用缓存时先查缓存）
+        
+        Args:
+            on_section: 提供时以流式方式接收响应，每完整输出一篇论文的解读即以其序号（从0开始）回调
+        """
+        if self.cache is not None:
+            key = self._response_cache_key(system_prompt, user_prompt)
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        
+        result = await self._request_llm_async(system_prompt, user_prompt, max_tokens, on_section)
+        if self.cache is not None and not result.startswith(FAILURE_PREFIX):
+            self.cache.set(key, result)
+        return result
+    
+    def _request_llm(self, system_prompt: str, user_prompt: str, max_tokens: int) -> str:
+        """发送LLM请求"""
         try:
             response = self.client.chat.completions.create(
                 model=self.model,
@@ -51,12 +402,48 @@ class PaperSummarizer:
             )
             return response.choices[0].message.content.strip()
         except Exception as e:
-            return f"生成失败: {str(e)}"
+            return f"{FAILURE_PREFIX}{str(e)}"
+    
+    async def _request_llm_async(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        max_tokens: int,
+        on_section: Optional[Callable[[int], None]] = None
+    ) -> str:
+        """异步发送LLM请求（on_section 见 _call_llm_async）"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model=self.model,
+                messages=[
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": user_prompt}
+                ],
+                temperature=0.3,
+                max_tokens=max_tokens,
+                stream=on_section is not None
+            )
+            if on_section is None:
+                return response.choices[0].message.content.strip()
+            
+            # 流式接收：每出现一个新的分隔符，前一篇论文的解读即已完整
+            sections = _SectionStream()
+            done = 0
+            async for chunk in response:
+                delta = chunk.choices[0].delta.content if chunk.choices else None
+                if not delta:
+                    continue
+                for _ in range(sections.feed(delta)):
+                    on_section(done)
+                    done += 1
+            return sections.text().strip()
+        except Exception as e:
+            return f"{FAILURE_PREFIX}{str(e)}"
     
     def summarize_paper_batch(
         self, 
         papers: List[Paper], 
-        keywords: Union[List[str], Dict[str, float]]
+        keywords: Union[List[str], Tuple[str, ...], Dict[str, float]]
     ) -> List[str]:
         """
         批量生成多篇论文的详细解读（一次LLM调用）
@@ -68,91 +455,215 @@ class PaperSummarizer:
         Returns:
             每篇论文的解读列表
         """
-        # 处理关键词格式
-        if isinstance(keywords, dict):
-            kw_list = list(keywords.keys())
-        else:
-            kw_list = keywords
+        kw_list, _ = _normalize_keywords(keywords)
+        summaries, keys = self._lookup_paper_summaries(papers, kw_list)
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+        if pending:
+            batch = [papers[i] for i in pending]
+            system_prompt, user_prompt, max_tokens = self._build_batch_prompt(batch, kw_list)
+            result = self._call_llm(system_prompt, user_prompt, max_tokens=max_tokens)
+            self._fill_paper_summaries(summaries, keys, pending, result)
+            
+            # 重试后整批仍失败：逐篇单独重试，避免一次失败丢失整批解读
+            if result.startswith(FAILURE_PREFIX) and len(pending) > 1:
+                print(f"⚠️ 批量解读失败，逐篇重试 {len(pending)} 篇论文")
+                for i in pending:
+                    summaries[i] = self.summarize_paper_batch([papers[i]], kw_list)[0]
+        return summaries
+    
+    async def summarize_paper_batch_async(
+        self, 
+        papers: List[Paper], 
+        keywords: Union[List[str], Tuple[str, ...], Dict[str, float]],
+        on_paper_done: Optional[Callable[[int], None]] = None
+    ) -> List[str]:
+        """
+        summarize_paper_batch 的异步版本
+        
+        Args:
+            on_paper_done: 可选回调，某篇论文的解读完整生成（流式检测到其后的分隔符）时
+                以该论文在 papers 中的序号调用，可用于提前报告进度
+        """
+        kw_list, _ = _normalize_keywords(keywords)
+        summaries, _ = await self._summarize_batch_async(papers, kw_list, on_paper_done)
+        return summaries
+    
+    async def _summarize_batch_async(
+        self,
+        papers: List[Paper],
+        kw_list: Tuple[str, ...],
+        on_paper_done: Optional[Callable[[int], None]] = None,
+        overview_papers: Optional[List[Tuple[Paper, Dict]]] = None
+    ) -> Tuple[List[str], Optional[str]]:
+        """
+        批量解读的实现；传入 overview_papers 时在同一次调用中附带生成今日概览
         
+        Returns:
+            (每篇论文的解读列表, 今日概览（未生成或解析失败时为None）)
+        """
+        summaries, keys = self._lookup_paper_summaries(papers, kw_list)
+        pending = [i for i, summary in enumerate(summaries) if summary is None]
+        overview = None
+        if pending:
+            batch = [papers[i] for i in pending]
+            system_prompt, user_prompt, max_tokens = self._build_batch_prompt(
+                batch, kw_list, overview_papers
+            )
+            on_section = None
+            if on_paper_done is not None:
+                on_section = lambda n: on_paper_done(pending[n]) if n < len(pending) else None
+            result = await self._call_llm_async(
+                system_prompt, user_prompt, max_tokens=max_tokens, on_section=on_section
+            )
+            if overview_papers is not None:
+                result, overview = self._split_overview(result)
+            self._fill_paper_summaries(summaries, keys, pending, result)
+            
+            # 重试后整批仍失败：逐篇单独重试（依次进行，不额外占用并发名额）
+            if result.startswith(FAILURE_PREFIX) and len(pending) > 1:
+                print(f"⚠️ 批量解读失败，逐篇重试 {len(pending)} 篇论文")
+                for i in pending:
+                    summaries[i] = (await self.summarize_paper_batch_async([papers[i]], kw_list))[0]
+        return summaries, overview
+    
+    def _lookup_paper_summaries(
+        self,
+        papers: List[Paper],
+        kw_list: Tuple[str, ...]
+    ) -> Tuple[List[Optional[str]], List[Optional[str]]]:
+        """
+        按论文查询缓存的解读（批次组成不同时也能复用单篇结果）
+        
+        Returns:
+            (解读列表（未命中为None）, 缓存键列表（未启用缓存时为None）)
+        """
+        if self.cache is None:
+            return [None] * len(papers), [None] * len(papers)
+        
+        keys = []
+        for paper in papers:
+            # 单篇论文的完整提示词包含模板、关键词和论文内容
+            system_prompt, user_prompt, _ = self._build_batch_prompt([paper], kw_list)
+            keys.append(_cache_key("paper", self.model, paper.id, system_prompt, user_prompt))
+        return [self.cache.get(key) for key in keys], keys
+    
+    def _fill_paper_summaries(
+        self,
+        summaries: List[Optional[str]],
+        keys: List[Optional[str]],
+        pending: List[int],
+        result: str
+    ):
+        """将一次调用的结果填入未命中的位置；按分隔符完整解析出每篇时才写入单篇缓存"""
+        parsed = self._split_batch_result(result)
+        cacheable = (
+            self.cache is not None
+            and len(parsed) == len(pending)
+            and not result.startswith(FAILURE_PREFIX)
+        )
+        if len(parsed) != len(pending):
+            parsed = self._parse_batch_result(result, len(pending))
+        
+        for i, summary in zip(pending, parsed):
+            summaries[i] = summary
+            if cacheable:
+                self.cache.set(keys[i], summary)
+    
+    def _build_batch_prompt(
+        self, 
+        papers: List[Paper], 
+        kw_list: Tuple[str, ...],
+        overview_papers: Optional[List[Tuple[Paper, Dict]]] = None
+    ) -> Tuple[str, str, int]:
+        """
+        构建批量解读的提示词
+        
+        Args:
+            papers: 论文列表
+            kw_list: 已统一格式的关键词（见 _normalize_keywords）
+            overview_papers: 今日全部论文 [(论文, 匹配详情), ...]，传入时要求在解读之后附带今日概览
+        
+        Returns:
+            (系统提示词, 用户提示词, max_tokens)
+        """
         # 构建多篇论文的输入
-        papers_text = ""
-        for i, paper in enumerate(papers, 1):
-            papers_text += f"""
+        papers_text = "".join(
+            f"""
 ---
 ## 论文 {i}
 **标题**: {paper.title}
 **摘要**: {paper.summary}
 ---
 """
+            for i, paper in enumerate(papers, 1)
+        )
         
-        system_prompt = """你是一位资深的AI/ML研究员，擅长用通俗易懂的中文解读学术论文。
-你的解读应该简洁、专业、有深度。"""
-
+        # 固定的说明全部位于系统提示词中，各次调用的前缀完全相同，便于服务端前缀缓存
         user_prompt = f"""请对以下 {len(papers)} 篇arXiv论文分别进行简要解读。
 
 **用户关注领域**: {', '.join(kw_list)}
 
 {papers_text}
-
-请对每篇论文从以下两个方面进行解读：
-
-1. **研究背景与挑战**（300-350字）：这个领域的现状是什么？论文要解决什么问题？
-
-2. **方法与实验结论**（300-350字）：论文提出了什么方法？取得了什么效果？
-
-**输出格式要求**：
-- 每篇论文之间用 "===论文N===" 分隔（N为论文序号1,2,3...）
-- 每篇论文包含两个段落，段落之间空一行
-- 不需要加粗或标题，直接写内容
-
-示例输出格式：
-===论文1===
-这个领域目前面临...研究背景与挑战的描述...
-
-该论文提出了...方法与实验结论的描述...
-===论文2===
-...
 """
 
         # 根据论文数量调整 max_tokens
-        max_tokens = min(1200 * len(papers), 4000)
-        result = self._call_llm(system_prompt, user_prompt, max_tokens=max_tokens)
-        
-        # 解析结果，按论文分割
-        summaries = []
-        parts = result.split("===论文")
-        
-        for part in parts[1:]:  # 跳过第一个空部分
-            # 移除论文序号标记
-            content = part.strip()
-            if content and content[0].isdigit():
-                # 移除 "1===" 这样的前缀
-                idx = content.find("===")
-                if idx != -1:
-                    content = content[idx + 3:].strip()
-                elif len(content) > 1:
-                    content = content[1:].strip()  # 只移除数字
-            summaries.append(content)
-        
-        # 如果解析失败，尝试使用简单分割
-        if len(summaries) != len(papers):
-            # 回退：均分结果
-            lines = result.split('\n')
-            chunk_size = max(len(lines) // len(papers), 1)
-            summaries = []
-            for i in range(len(papers)):
-                start = i * chunk_size
-                end = start + chunk_size if i < len(papers) - 1 else len(lines)
-                summaries.append('\n'.join(lines[start:end]))
+        output_tokens = OUTPUT_TOKENS_PER_PAPER * len(papers)
         
+        if overview_papers is not None:
+            user_prompt += f"""
+最后，请在全部解读之后另起一行输出 "===概览==="，并在其后用200-300字总结今日全部 {len(overview_papers)} 篇论文的整体情况：
+1. 今日论文主要聚焦在哪些研究方向？
+2. 有什么值得关注的研究趋势或热点？
+3. 对从事相关研究的读者有什么建议？
+
+**今日论文列表**:
+{self._overview_brief(overview_papers)}
+"""
+            output_tokens += OVERVIEW_MAX_TOKENS
+        
+        # 输出预算不超过上下文窗口扣除实际输入后的剩余部分，避免长摘要批次被截断或请求被拒
+        input_tokens = count_tokens(_BATCH_SYSTEM_PROMPT) + count_tokens(user_prompt)
+        context_left = MODEL_CONTEXT_TOKENS - input_tokens - CONTEXT_SAFETY_TOKENS
+        max_tokens = max(min(output_tokens, MAX_OUTPUT_TOKENS, context_left), 1)
+        return _BATCH_SYSTEM_PROMPT, user_prompt, max_tokens
+    
+    def _parse_batch_result(self, result: str, paper_count: int) -> List[str]:
+        """将批量解读结果按论文分割，段数与论文数不一致时按顺序对应并给出警告"""
+        if result.startswith(FAILURE_PREFIX):
+            return [result] * paper_count
+        
+        summaries = self._split_batch_result(result)
+        if len(summaries) == paper_count:
+            return summaries
+        
+        print(f"⚠️ 解读结果包含 {len(summaries)} 段，与论文数 {paper_count} 不一致，按顺序对应")
+        if not summaries:
+            # 没有分隔符：整段结果无法区分归属，每篇论文都展示完整内容
+            return [result.strip()] * paper_count
+        summaries = summaries[:paper_count]
+        summaries.extend(["（未生成解读）"] * (paper_count - len(summaries)))
         return summaries
     
-    def _generate_paper_table(self, summaries: List[Dict]) -> str:
+    def _split_batch_result(self, result: str) -> List[str]:
+        """按 ===论文N=== 分隔符分割批量解读结果（第一个分隔符之前的内容不是解读，丢弃）"""
+        return [part.strip() for part in _PAPER_SPLIT_RE.split(result)[1:]]
+    
+    def _split_overview(self, result: str) -> Tuple[str, Optional[str]]:
+        """从附带概览的批量结果中拆出 ===概览=== 之后的部分，返回 (解读部分, 概览或None)"""
+        if result.startswith(FAILURE_PREFIX):
+            return result, None
+        parts = _OVERVIEW_SPLIT_RE.split(result, maxsplit=1)
+        if len(parts) < 2 or not parts[1].strip():
+            return result, None
+        return parts[0], parts[1].strip()
+    
+    def _generate_paper_table(self, summaries: List[Dict], author_strs: Optional[List[str]] = None) -> str:
         """
         生成论文汇总表格
         
         Args:
             summaries: 论文总结列表
+            author_strs: 与 summaries 一一对应的已拼接作者字符串（None时现场拼接）
         
         Returns:
             Markdown格式的表格
@@ -161,30 +672,32 @@ class PaperSummarizer:
             return ""
         
         # 表头
-        table = "| # | 标题 | 作者 | 匹配关键词 | 得分 |\n"
-        table += "|:---:|:---|:---|:---|:---:|\n"
+        rows = [
+            "| # | 标题 | 作者 | 匹配关键词 | 得分 |\n",
+            "|:---:|:---|:---|:---|:---:|\n",
+        ]
+        
+        if author_strs is None:
+            author_strs = [', '.join(item['paper'].authors) for item in summaries]
         
         # 表格内容
-        for i, item in enumerate(summaries, 1):
+        for i, (item, authors_str) in enumerate(zip(summaries, author_strs), 1):
             paper = item['paper']
             details = item['match_details']
             
-            # 完整标题
-            title = paper.title
-            
-            # 完整作者列表
-            authors_str = ', '.join(paper.authors)
+            # 完整标题（转义竖线，避免破坏表格列）
+            title = _escape_table_cell(paper.title)
             
             # 匹配关键词
             matched = details.get('all_matched', [])
-            matched_str = ', '.join(matched) if matched else "-"
+            matched_str = _escape_table_cell(', '.join(matched)) if matched else "-"
             
             # 得分
             score = f"{paper.relevance_score:.2f}"
             
-            table += f"| {i} | {title} | {authors_str} | {matched_str} | {score} |\n"
+            rows.append(f"| {i} | {title} | {_escape_table_cell(authors_str)} | {matched_str} | {score} |\n")
         
-        return table
+        return "".join(rows)
     
     def generate_daily_overview(
         self, 
@@ -201,19 +714,8 @@ class PaperSummarizer:
         Returns:
             今日研究方向总结
         """
-        # 处理关键词格式
-        if isinstance(keywords, dict):
-            kw_list = list(keywords.keys())
-        else:
-            kw_list = keywords
-        
-        # 构建论文摘要列表
-        paper_briefs = []
-        for i, (paper, details) in enumerate(papers[:10], 1):  # 最多取前10篇
-            matched = details.get('all_matched', [])
-            paper_briefs.append(f"{i}. 《{paper.title}》\n   匹配关键词: {', '.join(matched)}")
-        
-        papers_text = '\n'.join(paper_briefs)
+        kw_list, _ = _normalize_keywords(keywords)
+        papers_text = self._overview_brief(papers)
         
         system_prompt = """你是一位学术领域的资深分析师，擅长从多篇论文中提炼研究趋势和方向。
 你的总结应该：
@@ -235,47 +737,133 @@ class PaperSummarizer:
 
 请直接输出总结内容，语气专业但不失亲和。"""
 
-        return self._call_llm(system_prompt, user_prompt, max_tokens=800)
+        return self._call_llm(system_prompt, user_prompt, max_tokens=OVERVIEW_MAX_TOKENS)
+    
+    def _overview_brief(self, papers: List[Tuple[Paper, Dict]]) -> str:
+        """概览提示词中的论文列表（标题与匹配关键词，最多 OVERVIEW_MAX_PAPERS 篇）"""
+        return '\n'.join(
+            f"{i}. 《{paper.title}》\n   匹配关键词: {', '.join(details.get('all_matched', []))}"
+            for i, (paper, details) in enumerate(papers[:OVERVIEW_MAX_PAPERS], 1)
+        )
     
     
     def summarize_papers(
         self,
         papers: List[Tuple[Paper, Dict]],
         keywords: Union[List[str], Dict[str, float]],
-        batch_size: int = 3
+        batch_size: int = 3,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
     ) -> List[Dict]:
         """
-        批量总结论文（使用批量LLM调用提高效率）
+        批量总结论文（使用批量LLM调用提高效率，各批次并发执行）
+        
+        同步接口，内部通过 asyncio.run 执行 summarize_papers_async，不能在运行中的事件循环内调用。
         
         Args:
             papers: [(论文, 匹配详情), ...] 列表
             keywords: 关键词
-            batch_size: 每次LLM调用处理的论文数量
+            batch_size: 每次LLM调用处理的论文数量上限（实际大小见 plan_batch_size）
+            max_concurrency: 同时进行的LLM调用数上限
         
         Returns:
             [{'paper': Paper, 'summary': str, 'match_details': dict}, ...]
         """
-        results = []
+        async def run():
+            try:
+                return await self.summarize_papers_async(papers, keywords, batch_size, max_concurrency)
+            finally:
+                # 异步客户端的连接属于本次事件循环，结束前关闭
+                await self.aclose()
+        
+        return asyncio.run(run())
+    
+    async def summarize_papers_async(
+        self,
+        papers: List[Tuple[Paper, Dict]],
+        keywords: Union[List[str], Dict[str, float]],
+        batch_size: int = 3,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS
+    ) -> List[Dict]:
+        """
+        批量总结论文（各批次的LLM调用并发执行）
+        
+        Args:
+            papers: [(论文, 匹配详情), ...] 列表
+            keywords: 关键词
+            batch_size: 每次LLM调用处理的论文数量上限（实际大小见 plan_batch_size）
+            max_concurrency: 同时进行的LLM调用数上限
+        
+        Returns:
+            [{'paper': Paper, 'summary': str, 'match_details': dict}, ...]，顺序与输入一致
+        """
         total = len(papers)
+        # 关键词格式只统一一次，各批次共用
+        kw_list, _ = _normalize_keywords(keywords)
+        batch_size = self.plan_batch_size([p[0] for p in papers], batch_size)
+        batches = [papers[i:i + batch_size] for i in range(0, total, batch_size)]
+        semaphore = asyncio.Semaphore(max(max_concurrency, 1))
         
-        # 按批次处理
-        for batch_start in range(0, total, batch_size):
-            batch_end = min(batch_start + batch_size, total)
-            batch_papers = papers[batch_start:batch_end]
-            
-            # 显示进度
-            paper_nums = f"{batch_start+1}-{batch_end}"
-            titles = [p[0].title[:30] + "..." for p in batch_papers]
-            print(f"📝 正在解读论文 [{paper_nums}/{total}]:")
-            for t in titles:
-                print(f"   - {t}")
-            
-            # 批量调用LLM
-            batch_paper_objs = [p[0] for p in batch_papers]
-            summaries = self.summarize_paper_batch(batch_paper_objs, keywords)
-            
-            # 组装结果
-            for i, ((paper, details), summary) in enumerate(zip(batch_papers, summaries)):
+        # 今日概览只依赖论文标题和匹配关键词，由最后一个批次（通常论文最少）顺带生成，省去一次往返
+        self.last_overview = None
+        fuse_overview = total >= MIN_PAPERS_FOR_OVERVIEW
+        overview_papers = papers if fuse_overview else None
+        
+        if self.use_batch_api and batches:
+            try:
+                batch_summaries = await asyncio.to_thread(
+                    self._summarize_with_batch_api, batches, kw_list, overview_papers
+                )
+                return self._assemble_results(batches, batch_summaries)
+            except Exception as e:
+                print(f"⚠️ Batch API 不可用，改为实时调用: {e}")
+        
+        async def summarize_batch(batch_start: int, batch_papers: List[Tuple[Paper, Dict]]) -> List[str]:
+            async with semaphore:
+                # 显示进度（整个批次的标题一次输出）
+                if self.verbose:
+                    paper_nums = f"{batch_start + 1}-{batch_start + len(batch_papers)}"
+                    print(f"📝 正在解读论文 [{paper_nums}/{total}]:\n" + "\n".join(
+                        f"   - {p[0].title[:30]}..." for p in batch_papers
+                    ))
+                
+                # 流式接收，每篇论文解读完成即报告（最后一篇和命中缓存的论文随整个批次完成）
+                reported = set()
+                
+                def on_paper_done(i: int):
+                    reported.add(i)
+                    print(f"   ✅ [{batch_start + i + 1}/{total}] {batch_papers[i][0].title[:30]}...")
+                
+                is_last_batch = batch_start + len(batch_papers) == total
+                summaries, overview = await self._summarize_batch_async(
+                    [p[0] for p in batch_papers], kw_list,
+                    on_paper_done if self.verbose else None,
+                    overview_papers=overview_papers if is_last_batch else None
+                )
+                if overview is not None:
+                    self.last_overview = overview
+                if self.verbose:
+                    for i in range(len(batch_papers)):
+                        if i not in reported:
+                            on_paper_done(i)
+                return summaries
+        
+        batch_summaries = await asyncio.gather(*[
+            summarize_batch(i * batch_size, batch)
+            for i, batch in enumerate(batches)
+        ])
+        
+        # gather 按提交顺序返回
+        return self._assemble_results(batches, batch_summaries)
+    
+    def _assemble_results(
+        self,
+        batches: List[List[Tuple[Paper, Dict]]],
+        batch_summaries: List[List[str]]
+    ) -> List[Dict]:
+        """将各批次的解读与论文、匹配详情组装为 summarize_papers 的返回格式"""
+        results = []
+        for batch, summaries in zip(batches, batch_summaries):
+            for (paper, details), summary in zip(batch, summaries):
                 results.append({
                     'paper': paper,
                     'summary': summary,
@@ -284,11 +872,113 @@ class PaperSummarizer:
         
         return results
     
+    def _summarize_with_batch_api(
+        self,
+        batches: List[List[Tuple[Paper, Dict]]],
+        kw_list: Tuple[str, ...],
+        overview_papers: Optional[List[Tuple[Paper, Dict]]] = None
+    ) -> List[List[str]]:
+        """
+        通过 Batch API 一次提交全部批次的解读请求，轮询直到任务结束
+        
+        命中缓存的论文不再提交；最后一个批次按需附带今日概览（写入 last_overview）。
+        服务端不支持 Batch API 或任务未成功完成时抛出异常，由调用方回退到实时调用。
+        
+        Returns:
+            每个批次的解读列表，顺序与 batches 一致
+        """
+        results = []
+        jobs = []  # (批次序号, 缓存键, 未命中位置, 系统提示词, 用户提示词)
+        lines = []
+        for n, batch in enumerate(batches):
+            batch_papers = [p[0] for p in batch]
+            summaries, keys = self._lookup_paper_summaries(batch_papers, kw_list)
+            results.append(summaries)
+            pending = [i for i, summary in enumerate(summaries) if summary is None]
+            if not pending:
+                continue
+            
+            is_last_batch = n == len(batches) - 1
+            system_prompt, user_prompt, max_tokens = self._build_batch_prompt(
+                [batch_papers[i] for i in pending], kw_list,
+                overview_papers if is_last_batch else None
+            )
+            jobs.append((n, keys, pending, system_prompt, user_prompt))
+            lines.append(json.dumps({
+                "custom_id": f"batch-{n}",
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self.model,
+                    "messages": [
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_prompt}
+                    ],
+                    "temperature": 0.3,
+                    "max_tokens": max_tokens
+                }
+            }, ensure_ascii=False))
+        
+        if not jobs:
+            return results
+        
+        # 提交任务并等待完成
+        input_file = self.client.files.create(
+            file=("requests.jsonl", ("\n".join(lines) + "\n").encode('utf-8')),
+            purpose="batch"
+        )
+        job = self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window=BATCH_API_COMPLETION_WINDOW
+        )
+        print(f"📮 已提交 Batch API 任务 {job.id}（{len(jobs)} 个请求），等待完成...")
+        while job.status not in BATCH_API_FINAL_STATUSES:
+            time.sleep(BATCH_API_POLL_SECONDS)
+            job = self.client.batches.retrieve(job.id)
+        if job.status != "completed" or not job.output_file_id:
+            raise RuntimeError(f"Batch API 任务 {job.id} 结束状态为 {job.status}")
+        
+        # 解析输出文件：每行对应一个请求，按 custom_id 对应（顺序不保证与提交一致）
+        responses = {}
+        for line in self.client.files.content(job.output_file_id).text.splitlines():
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            try:
+                response = item["response"]
+                if response["status_code"] != 200:
+                    raise ValueError(f"HTTP {response['status_code']}")
+                responses[item["custom_id"]] = response["body"]["choices"][0]["message"]["content"].strip()
+            except (KeyError, IndexError, TypeError, AttributeError, ValueError) as e:
+                error = item.get("error") or e
+                responses[item.get("custom_id")] = f"{FAILURE_PREFIX}{error}"
+        
+        for n, keys, pending, system_prompt, user_prompt in jobs:
+            result = responses.get(f"batch-{n}", f"{FAILURE_PREFIX}Batch API 未返回该请求的结果")
+            if self.cache is not None and not result.startswith(FAILURE_PREFIX):
+                self.cache.set(self._response_cache_key(system_prompt, user_prompt), result)
+            
+            if overview_papers is not None and n == len(batches) - 1:
+                result, self.last_overview = self._split_overview(result)
+            
+            if result.startswith(FAILURE_PREFIX):
+                # 单个请求失败：该批次改为实时调用（仍失败时逐篇重试）
+                print(f"⚠️ Batch API 请求 batch-{n} 失败，改为实时调用: {result}")
+                results[n] = self.summarize_paper_batch([p[0] for p in batches[n]], kw_list)
+            else:
+                self._fill_paper_summaries(results[n], keys, pending, result)
+        
+        if self.verbose:
+            print(f"   ✅ Batch API 完成 {sum(len(batch) for batch in batches)} 篇论文解读")
+        return results
+    
     def generate_digest(
         self,
         summaries: List[Dict],
         keywords: Union[List[str], Dict[str, float]],
-        date: str
+        date: str,
+        daily_overview: Optional[str] = None
     ) -> str:
         """
         生成完整的论文报告
@@ -302,17 +992,13 @@ class PaperSummarizer:
             summaries: 论文总结列表
             keywords: 关键词
             date: 日期
+            daily_overview: 已生成的今日概览（如 summarize_papers 后的 last_overview），None时单独生成
         
         Returns:
             完整的报告（Markdown格式）
         """
         # 处理关键词显示
-        if isinstance(keywords, dict):
-            kw_display = ', '.join(f"{k}({v})" for k, v in keywords.items())
-            kw_list = list(keywords.keys())
-        else:
-            kw_display = ', '.join(keywords)
-            kw_list = keywords
+        kw_list, kw_display = _normalize_keywords(keywords)
         
         if not summaries:
             return f"""# arXiv 论文日报 - {date}
@@ -323,15 +1009,25 @@ class PaperSummarizer:
         # 重建 papers 列表用于生成概览
         papers = [(item['paper'], item['match_details']) for item in summaries]
         
-        # 1. 生成今日概览
-        print("📊 正在生成今日论文概览...")
-        daily_overview = self.generate_daily_overview(papers, keywords)
+        # 完整作者列表在表格和详解中各用一次，只拼接一次
+        author_strs = [', '.join(paper.authors) for paper, _ in papers]
+        
+        # 1. 生成今日概览（未随批量解读生成时单独生成；论文很少时使用模板，省去一次LLM调用）
+        if daily_overview is None:
+            if len(summaries) < MIN_PAPERS_FOR_OVERVIEW:
+                daily_overview = (
+                    f"今日共{len(summaries)}篇相关论文，主题聚焦于：{', '.join(kw_list[:3])}。详见下方解读。"
+                )
+            else:
+                if self.verbose:
+                    print("📊 正在生成今日论文概览...")
+                daily_overview = self.generate_daily_overview(papers, keywords)
         
         # 2. 生成论文汇总表格
-        paper_table = self._generate_paper_table(summaries)
+        paper_table = self._generate_paper_table(summaries, author_strs)
         
-        # 3. 构建完整报告
-        report = f"""# arXiv 论文日报
+        # 3. 构建完整报告（各部分收集后一次拼接）
+        header = f"""# arXiv 论文日报
 
 **日期**: {date}
 
@@ -355,22 +1051,20 @@ class PaperSummarizer:
 
 """
         # 添加每篇论文的详细解读
-        for i, item in enumerate(summaries, 1):
+        sections = [header]
+        for i, (item, authors_str) in enumerate(zip(summaries, author_strs), 1):
             paper = item['paper']
             summary = item['summary']
             
-            # 全部作者
-            authors_str = ', '.join(paper.authors)
-            
-            report += f"""### {i}. {paper.title} [[查看论文]]({paper.abs_url})
+            sections.append(f"""### {i}. {paper.title} [[查看论文]]({paper.abs_url})
 
 **作者**: {authors_str}
 
 {summary}
 
-"""
+""")
         
-        return report
+        return "".join(sections)
 
 
 def summarize_relevant_papers(
@@ -380,7 +1074,9 @@ def summarize_relevant_papers(
     model: str = "deepseek-chat",
     api_key: str = "",
     base_url: str = "https://api.deepseek.com",
-    batch_size: int = 3
+    batch_size: int = 3,
+    cache_path: Optional[str] = None,
+    use_batch_api: bool = False
 ) -> str:
     """
     总结相关论文并生成报告
@@ -392,11 +1088,51 @@ def summarize_relevant_papers(
         model: LLM模型
         api_key: API密钥
         base_url: API基础URL
-        batch_size: 每次LLM调用处理的论文数量
+        batch_size: 每次LLM调用处理的论文数量上限
+        cache_path: LLM响应缓存路径（None表示不缓存）
+        use_batch_api: 是否通过 Batch API 提交解读请求
+    
+    Returns:
+        完整的论文报告
+    """
+    summarizer = PaperSummarizer(
+        model=model, api_key=api_key, base_url=base_url,
+        cache_path=cache_path, use_batch_api=use_batch_api
+    )
+    try:
+        summaries = summarizer.summarize_papers(papers, keywords, batch_size=batch_size)
+        return summarizer.generate_digest(summaries, keywords, date, summarizer.last_overview)
+    finally:
+        summarizer.close()
+
+
+async def summarize_relevant_papers_async(
+    papers: List[Tuple[Paper, Dict]],
+    keywords: Union[List[str], Dict[str, float]],
+    date: str,
+    model: str = "deepseek-chat",
+    api_key: str = "",
+    base_url: str = "https://api.deepseek.com",
+    batch_size: int = 3,
+    cache_path: Optional[str] = None,
+    use_batch_api: bool = False
+) -> str:
+    """
+    总结相关论文并生成报告（各批次并发调用LLM），参数同 summarize_relevant_papers
     
     Returns:
         完整的论文报告
     """
-    summarizer = PaperSummarizer(model=model, api_key=api_key, base_url=base_url)
-    summaries = summarizer.summarize_papers(papers, keywords, batch_size=batch_size)
-    return summarizer.generate_digest(summaries, keywords, date)
+    summarizer = PaperSummarizer(
+        model=model, api_key=api_key, base_url=base_url,
+        cache_path=cache_path, use_batch_api=use_batch_api
+    )
+    try:
+        summaries = await summarizer.summarize_papers_async(papers, keywords, batch_size=batch_size)
+        # 概览通常已随最后一个批次生成；未生成时使用同步客户端在线程中补生成，不阻塞事件循环
+        return await asyncio.to_thread(
+            summarizer.generate_digest, summaries, keywords, date, summarizer.last_overview
+        )
+    finally:
+        await summarizer.aclose()
+        summarizer.close()
@@ -60,13 +60,14 @@ def test_config():
         return None
 
 
-def test_crawl():
+def test_crawl(config=None):
     """测试爬取功能"""
     print("\n" + "=" * 60)
     print("🕷️ 测试爬取功能")
     print("=" * 60)
     
-    config = test_config()
+    if config is None:
+        config = test_config()
     if not config:
         return False
     
@@ -101,13 +102,14 @@ def test_crawl():
         return False
 
 
-def test_match():
+def test_match(config=None):
     """测试关键词匹配功能"""
     print("\n" + "=" * 60)
     print("🔍 测试关键词匹配功能")
     print("=" * 60)
     
-    config = test_config()
+    if config is None:
+        config = test_config()
     if not config:
         return None
     
@@ -168,13 +170,14 @@ def test_match():
         return None
 
 
-def test_summarize(papers=None):
+def test_summarize(papers=None, config=None):
     """测试LLM总结功能"""
     print("\n" + "=" * 60)
     print("🤖 测试LLM总结功能")
     print("=" * 60)
     
-    config = test_config()
+    if config is None:
+        config = test_config()
     if not config:
         return None
     
@@ -192,7 +195,7 @@ def test_summarize(papers=None):
         
         # 如果没有传入论文，先执行匹配
         if papers is None:
-            papers = test_match()
+            papers = test_match(config)
         
         if not papers:
             print("⚠️ 没有论文可供总结")
@@ -213,7 +216,10 @@ def test_summarize(papers=None):
         summaries = summarizer.summarize_papers(test_papers, config.keywords)
         
         # 生成报告
-        digest = summarizer.generate_digest(summaries, config.keywords, today)
+        digest = summarizer.generate_digest(
+            summaries, config.keywords, today, summarizer.last_overview
+        )
+        summarizer.close()
         
         print("\n" + "-" * 40)
         print("📄 生成的摘要预览:")
@@ -231,13 +237,14 @@ def test_summarize(papers=None):
         return None
 
 
-def test_email(digest: str = None):
+def test_email(digest: str = None, config=None):
     """测试邮件发送功能"""
     print("\n" + "=" * 60)
     print("📧 测试邮件发送功能")
     print("=" * 60)
     
-    config = test_config()
+    if config is None:
+        config = test_config()
     if not config:
         return False
     
@@ -303,6 +310,7 @@ def test_email(digest: str = None):
             content=digest,
             is_markdown=True
         )
+        sender.close()
         
         if success:
             print("\n✅ 邮件发送测试通过")
@@ -326,18 +334,23 @@ def test_all():
     
     today = datetime.now().strftime("%Y-%m-%d")
     
+    # 配置只加载一次，传递给各步骤
+    config = test_config()
+    if not config:
+        return False
+    
     # 步骤1: 爬取
     print("\n" + "=" * 60)
     print("📥 步骤 1/4: 爬取")
     print("=" * 60)
-    if not test_crawl():
+    if not test_crawl(config):
         print("\n⚠️ 爬取失败，继续使用已有数据...")
     
     # 步骤2: 匹配
     print("\n" + "=" * 60)
     print("🔍 步骤 2/4: 匹配")
     print("=" * 60)
-    papers = test_match()
+    papers = test_match(config)
     
     if not papers:
         print("\n❌ 无论文数据，流程终止")
@@ -347,20 +360,18 @@ def test_all():
     print("\n" + "=" * 60)
     print("🤖 步骤 3/4: 总结")
     print("=" * 60)
-    digest = test_summarize(papers)
+    digest = test_summarize(papers, config)
     
     if not digest:
         print("\n⚠️ 总结失败，使用简单报告...")
         # 生成简单报告
-        from config_loader import get_config
-        config = get_config()
         digest = f"# arXiv论文日报 - {today}\n\n找到 {len(papers)} 篇相关论文。"
     
     # 步骤4: 发送邮件
     print("\n" + "=" * 60)
     print("📧 步骤 4/4: 发送邮件")
     print("=" * 60)
-    test_email(digest)
+    test_email(digest, config)
     
     print("\n" + "=" * 60)
     print("✅ 完整流程测试结束")